@@ -0,0 +1,86 @@
+import asyncio
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from src.apps.dto import OAuth2AppInfoDTO
+from src.logger import logger
+from src.services.lru_cache import CacheStats, LRUCache, NegativeCache
+
+
+class UnknownClientIdsCache(NegativeCache[UUID]):
+    pass
+
+
+class AppsCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache: LRUCache[UUID, OAuth2AppInfoDTO] = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def get(self, client_id: UUID) -> OAuth2AppInfoDTO | None:
+        return self.cache.get(client_id)
+
+    def set(self, app: OAuth2AppInfoDTO) -> None:
+        self.cache.set(app.client_id, app)
+
+    def discard(self, client_id: UUID) -> None:
+        self.cache.pop(client_id)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+class AppsCacheInvalidator:
+    def __init__(self, cache: AppsCache, redis: Redis, channel: str, reconnect_delay: float = 1) -> None:
+        self.cache = cache
+        self.redis = redis
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+
+    async def invalidate(self, client_id: UUID) -> None:
+        self.cache.discard(client_id)
+        try:
+            await self.redis.publish(self.channel, str(client_id))
+        except Exception:
+            logger.error("Failed to publish apps cache invalidation: ", exc_info=True)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def handle(self, data: bytes | str) -> None:
+        try:
+            client_id = UUID(data.decode() if isinstance(data, bytes) else data)
+        except ValueError:
+            logger.warning("Ignoring malformed apps cache invalidation: %r", data)
+            return
+        self.cache.discard(client_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                logger.error("Apps cache invalidation subscription failed: ", exc_info=True)
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _listen(self) -> None:
+        async with self.redis.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            self.cache.clear()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.handle(message["data"])
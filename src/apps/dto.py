@@ -26,6 +26,7 @@ class AppUpdateInfoDTO:
 class OAuth2AppInfoDTO:
     client_id: UUID
     client_secret: UUID
-    redirect_uris: list[str]
-    scopes: list[str]
+    redirect_uris: frozenset[str]
+    scopes: frozenset[str]
+    scopes_mask: int
     is_authoritative: bool
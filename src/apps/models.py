@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID, uuid4
 
-from beanie import Document
+from beanie import Document, Indexed
 from pydantic import Field
 
 from src.apps.entities import Application, ApplicationFields
@@ -10,11 +11,11 @@ from src.apps.entities import Application, ApplicationFields
 class AppODM(Document):
     id: UUID = Field(default_factory=uuid4)  # type: ignore
     name: str
-    client_id: UUID
+    client_id: Annotated[UUID, Indexed(unique=True)]
     client_secret: UUID
     redirect_uris: list[str]
     scopes: list[str]
-    creator_id: UUID
+    creator_id: Annotated[UUID, Indexed()]
     description: str | None = None
     website: str | None = None
     created_at: datetime
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 
+from beanie import UpdateResponse
+from beanie.operators import Set
+
 from src.apps.dto import AppUpdateInfoDTO
 from src.apps.entities import Application, ApplicationFields
 from src.apps.models import AppODM
@@ -52,32 +55,37 @@ class MongoAppsRepository(IAppsRepository):
         return app_model.to_entity()
 
     async def update_client_secret(self, app_id: UUID, client_secret: UUID) -> Application:
-        app_model = await AppODM.find_one(AppODM.id == app_id)
+        app_model = await AppODM.find_one(AppODM.id == app_id).update(  # pyright: ignore[reportGeneralTypeIssues]
+            Set({AppODM.client_secret: client_secret}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
         if not app_model:
             raise Exception("App not found")
-
-        app_model.client_secret = client_secret
-        await app_model.save()
         return app_model.to_entity()
 
     async def delete(self, id: UUID) -> None:
         await AppODM.find_one(AppODM.id == id).delete()
 
     async def update_app_info(self, dto: AppUpdateInfoDTO) -> Application:
-        app = await AppODM.find_one(AppODM.id == dto.app_id)
-        if not app:
-            raise Exception("App not found")
-
+        changes = {}
         if dto.name:
-            app.name = dto.name
+            changes[AppODM.name] = dto.name
         if dto.description:
-            app.description = dto.description
+            changes[AppODM.description] = dto.description
         if dto.redirect_uris:
-            app.redirect_uris = dto.redirect_uris
+            changes[AppODM.redirect_uris] = dto.redirect_uris
         if dto.scopes:
-            app.scopes = dto.scopes
+            changes[AppODM.scopes] = dto.scopes
         if dto.website:
-            app.website = dto.website
-
-        await app.save()
+            changes[AppODM.website] = dto.website
+
+        if changes:
+            app = await AppODM.find_one(AppODM.id == dto.app_id).update(  # pyright: ignore[reportGeneralTypeIssues]
+                Set(changes),
+                response_type=UpdateResponse.NEW_DOCUMENT,
+            )
+        else:
+            app = await AppODM.find_one(AppODM.id == dto.app_id)
+        if not app:
+            raise Exception("App not found")
         return app.to_entity()
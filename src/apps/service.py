@@ -3,11 +3,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID, uuid4
 
+from src.apps.cache import AppsCache, AppsCacheInvalidator, UnknownClientIdsCache
 from src.apps.dto import AppUpdateInfoDTO, CreateAppDTO, OAuth2AppInfoDTO
 from src.apps.entities import Application, ApplicationFields
 from src.exceptions import ServiceError, ServiceErrorCode
 from src.schemas import AuthoritativeApp
 from src.services.authoritative_apps import AuthoritativeAppsService
+from src.services.scope_registry import ScopeRegistry
 
 from .repository import IAppsRepository
 
@@ -35,6 +37,9 @@ class IAppsService(ABC):
     @abstractmethod
     async def update_app_info(self, dto: AppUpdateInfoDTO) -> Application: ...
 
+    @abstractmethod
+    async def invalidate_cached_app(self, client_id: UUID) -> None: ...
+
     @abstractmethod
     def validate_access(self, user_id: UUID, app: Application) -> None: ...
 
@@ -43,9 +48,13 @@ class IAppsService(ABC):
 class AppsService(IAppsService):
     repository: IAppsRepository
     authoritative_apps: AuthoritativeAppsService
+    unknown_client_ids: UnknownClientIdsCache
+    apps_cache: AppsCache
+    apps_cache_invalidator: AppsCacheInvalidator
+    scope_registry: ScopeRegistry
 
     async def create_new_app(self, dto: CreateAppDTO) -> Application:
-        return await self.repository.add(
+        app = await self.repository.add(
             ApplicationFields(
                 name=dto.name,
                 client_id=uuid4(),
@@ -59,6 +68,8 @@ class AppsService(IAppsService):
                 is_web_message_allowed=False,
             )
         )
+        self.unknown_client_ids.discard(app.client_id)
+        return app
 
     async def get_all_by_user_id(self, user_id: UUID) -> list[Application]:
         apps = await self.repository.get_apps_by_user_id(user_id)
@@ -68,21 +79,34 @@ class AppsService(IAppsService):
         return await self.repository.get(app_id)
 
     async def get_by_client_id(self, client_id: UUID) -> OAuth2AppInfoDTO | None:
+        app_info = self.apps_cache.get(client_id)
+        if app_info:
+            return app_info
+
         app = self.authoritative_apps.get_by_client_id(client_id)
         if not app:
+            if client_id in self.unknown_client_ids:
+                return None
             app = await self.repository.get_by_client_id(client_id)
         if not app:
+            self.unknown_client_ids.add(client_id)
             return None
-        return OAuth2AppInfoDTO(
+        app_info = OAuth2AppInfoDTO(
             client_id=app.client_id,
             client_secret=app.client_secret,
-            redirect_uris=app.redirect_uris,
-            scopes=app.scopes,
+            redirect_uris=frozenset(app.redirect_uris),
+            scopes=frozenset(app.scopes),
+            scopes_mask=self.scope_registry.known_mask(app.scopes),
             is_authoritative=isinstance(app, AuthoritativeApp),
         )
+        self.apps_cache.set(app_info)
+        return app_info
 
     async def delete(self, app_id: UUID) -> None:
+        app = await self.repository.get(app_id)
         await self.repository.delete(app_id)
+        if app:
+            await self.apps_cache_invalidator.invalidate(app.client_id)
 
     async def regenerate_client_secret(self, app_id: UUID) -> Application:
         new_client_secret = uuid4()
@@ -91,6 +115,9 @@ class AppsService(IAppsService):
     async def update_app_info(self, dto: AppUpdateInfoDTO) -> Application:
         return await self.repository.update_app_info(dto)
 
+    async def invalidate_cached_app(self, client_id: UUID) -> None:
+        await self.apps_cache_invalidator.invalidate(client_id)
+
     def validate_access(self, user_id: UUID, app: Application) -> None:
         if app.creator_id != user_id:
             raise ServiceError(code=ServiceErrorCode.INSUFFICIENT_PERMISSIONS)
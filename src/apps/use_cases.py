@@ -65,7 +65,9 @@ class RegenerateClientSecretUseCase:
 
         self.apps_service.validate_access(command.user.id, app)
 
-        return await self.apps_service.regenerate_client_secret(app.id)
+        app = await self.apps_service.regenerate_client_secret(app.id)
+        await self.apps_service.invalidate_cached_app(app.client_id)
+        return app
 
 
 @dataclass
@@ -79,6 +81,7 @@ class UpdateAppInfoCommand:
     website: str | None = None
 
 
+@dataclass
 class UpdateAppInfoUseCase:
     apps_service: IAppsService
 
@@ -88,7 +91,7 @@ class UpdateAppInfoUseCase:
             raise AppNotFound
 
         self.apps_service.validate_access(command.user.id, app)
-        return await self.apps_service.update_app_info(
+        app = await self.apps_service.update_app_info(
             AppUpdateInfoDTO(
                 app_id=app.id,
                 name=command.name,
@@ -98,3 +101,5 @@ class UpdateAppInfoUseCase:
                 website=command.website,
             )
         )
+        await self.apps_service.invalidate_cached_app(app.client_id)
+        return app
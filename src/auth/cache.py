@@ -0,0 +1,42 @@
+import hashlib
+from collections.abc import Iterable
+from uuid import UUID
+
+from src.services.lru_cache import CacheStats, LRUCache, NegativeCache
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class SessionTokensCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache: LRUCache[bytes, UUID] = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def get(self, token: str) -> UUID | None:
+        return self.cache.get(_digest(token))
+
+    def set(self, token: str, session_id: UUID) -> None:
+        self.cache.set(_digest(token), session_id)
+
+    def invalidate(self, session_ids: Iterable[UUID]) -> int:
+        return self.cache.discard_values(set(session_ids))
+
+
+class InvalidSessionTokensCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache: NegativeCache[bytes] = NegativeCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def __contains__(self, token: str) -> bool:
+        return _digest(token) in self.cache
+
+    def add(self, token: str) -> None:
+        self.cache.add(_digest(token))
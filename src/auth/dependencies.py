@@ -2,12 +2,13 @@ from typing import Annotated
 
 from fastapi import Response, Security
 
-from src.auth.exceptions import InvalidSession, NotAuthenticated
+from src.auth.exceptions import InsufficientPermissions, InvalidSession, NotAuthenticated
 from src.auth.service import IAuthService
+from src.config import settings
 from src.dependencies import Provide
 from src.sessions.dependencies import SessionCookie
 from src.sessions.entities import Session
-from src.sessions.utils import delete_session_cookie
+from src.sessions.utils import delete_session_cookie, set_session_cookie
 from src.users.entities import User
 
 
@@ -17,11 +18,15 @@ async def validate_session(
     if session_cookie is None:
         return None
     try:
-        return await auth_service.validate_session(session_cookie.token)
+        user, session, session_token = await auth_service.authenticate(session_cookie.token)
     except InvalidSession as e:
         delete_session_cookie(res=res)
         raise e
 
+    if session_token is not None:
+        set_session_cookie(session_token, res=res)
+    return user, session
+
 
 async def get_user_with_session(
     session: Annotated[tuple[User, Session] | None, Security(validate_session)],
@@ -45,6 +50,16 @@ async def get_user(
 UserAuthorization = Annotated[User, Security(get_user)]
 
 
+async def get_admin(user: UserAuthorization) -> User:
+    if user.id not in settings.ADMIN_USER_IDS:
+        raise InsufficientPermissions
+
+    return user
+
+
+AdminAuthorization = Annotated[User, Security(get_admin)]
+
+
 async def get_user_with_session_optional(
     session: Annotated[tuple[User, Session] | None, Security(validate_session)],
 ) -> tuple[User, Session] | None:
@@ -29,6 +29,13 @@ class InvalidSession(ServiceError):
         )
 
 
+class InsufficientPermissions(ServiceError):
+    def __init__(self) -> None:
+        super().__init__(
+            code=ServiceErrorCode.INSUFFICIENT_PERMISSIONS,
+        )
+
+
 class InactiveUser(ServiceError):
     def __init__(self) -> None:
         super().__init__(
@@ -1,47 +1,105 @@
+import time
 from dataclasses import dataclass
+from datetime import datetime
 from uuid import UUID
 
+from src.auth.cache import InvalidSessionTokensCache, SessionTokensCache
 from src.auth.exceptions import InactiveUser, InvalidSession
+from src.auth.tokens import SessionTokenCodec
+from src.config import settings
 from src.services.hash import Hash
 from src.services.jwe import JWE
 from src.sessions.entities import Session
 from src.sessions.service import ISessionsService
 from src.users.entities import User
-from src.users.service import IUsersService
 
 
 class IAuthService:
-    async def validate_session(self, session_token: str) -> tuple[User, Session]: ...
+    async def authenticate(self, session_token: str) -> tuple[User, Session, str | None]: ...
+
+    async def issue_session_token(self, user: User, session: Session) -> str: ...
 
 
 @dataclass
 class AuthService(IAuthService):
-    users_service: IUsersService
     sessions_service: ISessionsService
     hash_service: Hash
     jwe: JWE
+    session_tokens_cache: SessionTokensCache
+    session_token_codec: SessionTokenCodec
+    invalid_session_tokens: InvalidSessionTokensCache
 
-    async def validate_session(self, session_token: str) -> tuple[User, Session]:
-        session_id_bytes = self.jwe.decode(session_token)
-        if session_id_bytes is None:
+    async def authenticate(self, session_token: str) -> tuple[User, Session, str | None]:
+        if session_token in self.invalid_session_tokens:
             raise InvalidSession
 
         try:
-            session_id = UUID(bytes=session_id_bytes)
-        except Exception:
-            raise InvalidSession
+            return await self._authenticate(session_token)
+        except InvalidSession:
+            self.invalid_session_tokens.add(session_token)
+            raise
 
-        session = await self.sessions_service.get_by_id(session_id)
-        if session is None:
-            raise InvalidSession
+    async def _authenticate(self, session_token: str) -> tuple[User, Session, str | None]:
+        if settings.SESSION_TOKEN_MODE != "stateless":
+            user, session = await self._validate_session(session_token)
+            return user, session, None
+
+        snapshot = self.session_token_codec.decode(session_token)
+        if (
+            snapshot is not None
+            and time.time() < snapshot.revalidate_at
+            and not await self.sessions_service.is_revoked(snapshot.session.id)
+        ):
+            if snapshot.session.expires_at <= datetime.now():
+                raise InvalidSession
+            if not snapshot.user.active:
+                raise InactiveUser
+            await self.sessions_service.update_last_used(snapshot.session)
+            return snapshot.user, snapshot.session, None
+
+        if snapshot is not None:
+            user, session = await self.validate_session_by_id(snapshot.session.id)
+        else:
+            user, session = await self._validate_session(session_token)
+        return user, session, self.session_token_codec.encode(user, session)
+
+    async def issue_session_token(self, user: User, session: Session) -> str:
+        if settings.SESSION_TOKEN_MODE == "stateless":
+            return self.session_token_codec.encode(user, session)
+        return await self.jwe.encode(session.id.bytes)
+
+    async def _validate_session(self, session_token: str) -> tuple[User, Session]:
+        session_id = self.session_tokens_cache.get(session_token)
+        if session_id is None:
+            session_id = await self.decode_session_token(session_token)
+            self.session_tokens_cache.set(session_token, session_id)
+
+        return await self.validate_session_by_id(session_id)
 
-        user = await self.users_service.get_by_id(session.user_id)
-        if not user:
+    async def validate_session_by_id(self, session_id: UUID) -> tuple[User, Session]:
+        session, user = await self.get_session_with_user(session_id)
+        if session.expires_at <= datetime.now():
             raise InvalidSession
 
         if not user.active:
             raise InactiveUser
 
-        await self.sessions_service.update_last_used(session_id)
+        await self.sessions_service.update_last_used(session)
 
         return user, session
+
+    async def get_session_with_user(self, session_id: UUID) -> tuple[Session, User]:
+        result = await self.sessions_service.get_by_id_with_user(session_id)
+        if result is None:
+            raise InvalidSession
+        return result
+
+    async def decode_session_token(self, session_token: str) -> UUID:
+        session_id_bytes = await self.jwe.decode(session_token)
+        if session_id_bytes is None:
+            raise InvalidSession
+
+        try:
+            return UUID(bytes=session_id_bytes)
+        except Exception:
+            raise InvalidSession
@@ -0,0 +1,98 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+import orjson
+from jwcrypto import jwe
+
+from src.services.jwe import DIRECT_ALGORITHM, DIRECT_ENCRYPTION
+from src.services.key_manager import KeyManager
+from src.sessions.entities import Session
+from src.users.entities import User
+
+SESSION_TOKEN_TYPE = "session+jwe"
+SESSION_TOKEN_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class SessionSnapshot:
+    user: User
+    session: Session
+    revalidate_at: float
+
+
+class SessionTokenCodec:
+    def __init__(self, key_manager: KeyManager, revalidate_after: float) -> None:
+        self.key_manager = key_manager
+        self.revalidate_after = revalidate_after
+
+    def encode(self, user: User, session: Session) -> str:
+        payload = {
+            "v": SESSION_TOKEN_VERSION,
+            "rv": time.time() + self.revalidate_after,
+            "sid": str(session.id),
+            "ip": session.ip_address,
+            "lu": session.last_used.isoformat(),
+            "exp": session.expires_at.isoformat(),
+            "uid": str(user.id),
+            "un": user.username,
+            "em": user.email,
+            "ev": user.email_verified,
+            "img": user.image_url,
+            "act": user.active,
+            "ca": user.created_at.isoformat(),
+        }
+        key = self.key_manager.get_random_key()
+        protected_header = {
+            "alg": DIRECT_ALGORITHM,
+            "enc": DIRECT_ENCRYPTION,
+            "typ": SESSION_TOKEN_TYPE,
+            "kid": key.symmetric_kid,
+        }
+        jwetoken = jwe.JWE(orjson.dumps(payload), recipient=key.symmetric_key, protected=protected_header)
+        return jwetoken.serialize(compact=True)
+
+    def decode(self, token: str) -> SessionSnapshot | None:
+        try:
+            jwetoken = jwe.JWE(algs=[DIRECT_ALGORITHM, DIRECT_ENCRYPTION])
+            jwetoken.deserialize(token)
+            if jwetoken.jose_header.get("typ") != SESSION_TOKEN_TYPE:
+                return None
+
+            kid = jwetoken.jose_header.get("kid")
+            if not isinstance(kid, str):
+                return None
+
+            key = self.key_manager.symmetric_keys_by_kid.get(kid)
+            if key is None:
+                return None
+
+            jwetoken.decrypt(key=key)
+            payload = orjson.loads(jwetoken.payload)
+            if payload["v"] != SESSION_TOKEN_VERSION:
+                return None
+
+            user_id = UUID(payload["uid"])
+            return SessionSnapshot(
+                user=User(
+                    id=user_id,
+                    username=payload["un"],
+                    email=payload["em"],
+                    email_verified=payload["ev"],
+                    image_url=payload["img"],
+                    hashed_password=b"",
+                    active=payload["act"],
+                    created_at=datetime.fromisoformat(payload["ca"]),
+                ),
+                session=Session(
+                    id=UUID(payload["sid"]),
+                    user_id=user_id,
+                    last_used=datetime.fromisoformat(payload["lu"]),
+                    ip_address=payload["ip"],
+                    expires_at=datetime.fromisoformat(payload["exp"]),
+                ),
+                revalidate_at=payload["rv"],
+            )
+        except Exception:
+            return None
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 
 from src.auth.exceptions import InactiveUser, InvalidCredentials
+from src.auth.service import IAuthService
 from src.exceptions import FieldError, FieldErrorCode, ServiceError, ServiceErrorCode
 from src.services.hash import Hash
-from src.services.jwe import JWE
 from src.sessions.dto import CreateSessionDTO
 from src.sessions.entities import Session
 from src.sessions.service import ISessionsService
@@ -55,8 +55,8 @@ class LoginCommand:
 class LoginUseCase:
     users_service: IUsersService
     sessions_service: ISessionsService
+    auth_service: IAuthService
     hash_service: Hash
-    jwe: JWE
 
     async def execute(self, command: LoginCommand) -> str:
         user = await self.users_service.get_user_by_email_or_username(command.login)
@@ -67,7 +67,7 @@ class LoginUseCase:
         elif not user.active:
             raise InactiveUser
 
-        elif not self.hash_service.check(
+        elif not await self.hash_service.check(
             value=command.password,
             hashed_value=user.hashed_password,
         ):
@@ -79,8 +79,7 @@ class LoginUseCase:
                 ip_address=command.ip_address,
             )
         )
-        session_token = self.jwe.encode(session.id.bytes)
-        return session_token
+        return await self.auth_service.issue_session_token(user, session)
 
 
 @dataclass
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from pydantic import BaseModel, MongoDsn, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +30,12 @@ class Settings(SmtpSettings, BaseSettings):
     REDIS_URL: RedisDsn
 
     ALGORITHM: str = "RS256"
+    JWE_ALGORITHM: str = "RSA-OAEP-256"
+
+    CRYPTO_EXECUTOR: str = "inline"
+    CRYPTO_WORKERS: int = 2
+    CRYPTO_BATCH_SIZE: int = 32
+    CRYPTO_BATCH_DELAY_SECONDS: float = 0.0005
 
     FRONTEND_URL: str = "http://localhost:5173"
 
@@ -35,12 +43,48 @@ class Settings(SmtpSettings, BaseSettings):
 
     MONGO_DATABASE_NAME: str = "auth_service"
     MONGO_URI: MongoDsn
+    MONGO_QUERY_PLAN_CHECK: str = "warn"
+
+    HASH_EXECUTOR: str = "thread"
+    HASH_WORKERS: int = 4
+    HASH_MAX_CONCURRENCY: int = 4
+    HASH_MAX_QUEUE_SIZE: int = 64
+    HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0
 
     SESSION_EXPIRE_HOURS: int = 24 * 30
     SESSION_KEY: str = "session"
+    SESSIONS_BACKEND: str = "mongo"
+    SESSIONS_PAGE_SIZE: int = 50
+    SESSIONS_MAX_PAGE_SIZE: int = 200
+    SESSIONS_REVOKE_BATCH_SIZE: int = 500
+    SESSION_LAST_USED_FLUSH_INTERVAL_SECONDS: float = 5
+    SESSION_LAST_USED_BATCH_SIZE: int = 1000
+    SESSION_LAST_USED_MIN_INTERVAL_SECONDS: float = 0
+    SESSION_TOKEN_MODE: str = "reference"
+    SESSION_REVALIDATE_SECONDS: float = 60
+    SESSION_TOKENS_CACHE_SIZE: int = 10_000
+    SESSION_TOKENS_CACHE_TTL_SECONDS: int = 300
+
+    NEGATIVE_CACHE_SIZE: int = 10_000
+    NEGATIVE_CACHE_TTL_SECONDS: float = 30
+
+    APPS_CACHE_SIZE: int = 1_000
+    APPS_CACHE_TTL_SECONDS: float = 60
+    APPS_CACHE_CHANNEL: str = "apps_cache:invalidate"
+
+    ADMIN_USER_IDS: list[UUID] = []
 
     AUTHORITATIVE_APPS_PATH: str = "/app/config/apps.json"
     CERT_DIR: str = "/app/config"
 
+    KEY_ROTATION_ENABLED: bool = True
+    KEY_ROTATION_INTERVAL_SECONDS: float = 30
+    KEY_ROTATION_GRACE_SECONDS: float = 30 * 24 * 3600
+
+    WELL_KNOWN_MAX_AGE_SECONDS: int = 300
+
+    STATS_REPORT_ENABLED: bool = True
+    STATS_REPORT_INTERVAL_SECONDS: float = 60
+
 
 settings = Settings()  # type: ignore
@@ -4,6 +4,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from redis.asyncio import ConnectionPool as RedisConnectionPool
 from redis.asyncio import Redis
 
+from src.apps.cache import AppsCache, AppsCacheInvalidator, UnknownClientIdsCache
 from src.apps.models import AppODM
 from src.apps.repository import IAppsRepository, MongoAppsRepository
 from src.apps.service import AppsService, IAppsService
@@ -13,9 +14,13 @@ from src.apps.use_cases import (
     RegenerateClientSecretUseCase,
     UpdateAppInfoUseCase,
 )
+from src.auth.cache import InvalidSessionTokensCache, SessionTokensCache
 from src.auth.service import AuthService, IAuthService
+from src.auth.tokens import SessionTokenCodec
 from src.auth.use_cases import LoginUseCase, LogoutUseCase, SignUpUseCase
 from src.config import settings
+from src.dependencies import resolve
+from src.oauth2.cache import IssuedTokensCache
 from src.oauth2.service import OAuthService
 from src.oauth2.use_cases import GetAppScopesUseCase, OAuthAuthorizeUseCase, OAuthRequestUseCase, OAuthTokenUseCase
 from src.oauth2_sessions.models import OAuth2SessionODM
@@ -23,31 +28,39 @@ from src.oauth2_sessions.repository import IOAuth2SessionsRepository, MongoOAuth
 from src.oauth2_sessions.service import IOAuthSessionsService, OAuthSessionsService
 from src.schemas import AppScopes
 from src.services.authoritative_apps import AuthoritativeAppsService
+from src.services.crypto_pool import CryptoPool, ProcessPoolJWE, ProcessPoolJWT
 from src.services.emails import EmailService, IEmailService
-from src.services.hash import Hash, ImplHash
-from src.services.jwe import JWE, ImplJWE
+from src.services.hash import Hash, HashScheduler, ImplHash, create_executor
+from src.services.jwe import JWE, RSA_ALGORITHM, ImplJWE
 from src.services.jwt import JWT, ImplJWT
 from src.services.key_manager import KeyManager
+from src.services.key_rotation import KeyRotationWatcher
 from src.services.oauth_auth_requests import (
     AuthorizationRequestsRepository,
     AuthReqService,
     IAuthReqRepository,
     IAuthReqService,
 )
+from src.services.query_plans import check_query_plans
+from src.services.scope_registry import ScopeRegistry
+from src.services.stats import StatsReporter
+from src.sessions.buffer import LastUsedBuffer
 from src.sessions.models import SessionODM
-from src.sessions.repository import ISessionsRepository, MongoSessionsRepository
+from src.sessions.repository import ISessionsRepository, MongoSessionsRepository, RedisSessionsRepository
+from src.sessions.revocations import SessionRevocations
 from src.sessions.service import ISessionsService, SessionsService
+from src.sessions.use_cases import GetSessionsByUserIdUseCase, GetUserSessionsUseCase, RevokeSessionsUseCase
 from src.users.models import UserODM
 from src.users.repository import IUsersRepository, MongoUsersRepository
 from src.users.service import IUsersService, UsersService
 from src.users.use_cases import GetMeUseCase
 from src.utils import load_authoritative_apps, load_certs_and_create_key_pairs
 from src.well_known.service import WellKnownService
-from src.well_known.use_cases import GetJWKsUseCase, GetOpenIdConfigurationUseCase
+from src.well_known.use_cases import GetJWKsUseCase, GetOpenIdConfigurationUseCase, GetScopeRegistryUseCase
 
 
 def create_redis_connection_pool() -> RedisConnectionPool:
-    return RedisConnectionPool.from_url(settings.REDIS_URL.unicode_string())
+    return RedisConnectionPool.from_url(settings.REDIS_URL.unicode_string(), decode_responses=False)
 
 
 async def init_mongodb() -> None:
@@ -63,49 +76,138 @@ async def init_mongodb() -> None:
             AppODM,
         ],
     )
+    await check_query_plans(settings.MONGO_QUERY_PLAN_CHECK)
 
 
 async def init_container() -> punq.Container:
     container = punq.Container()
 
     key_pairs = load_certs_and_create_key_pairs()
-    key_manager = KeyManager(key_pairs=key_pairs)
+    key_manager = KeyManager(
+        key_pairs=key_pairs,
+        rsa_algorithm=settings.ALGORITHM,
+        require_encryption_keys=settings.JWE_ALGORITHM == RSA_ALGORITHM,
+    )
     container.register(KeyManager, instance=key_manager, scope=punq.Scope.singleton)
 
+    key_rotation_watcher = KeyRotationWatcher(
+        key_manager=key_manager,
+        cert_dir=settings.CERT_DIR,
+        interval=settings.KEY_ROTATION_INTERVAL_SECONDS,
+        grace_period=settings.KEY_ROTATION_GRACE_SECONDS,
+        activation_delay=settings.WELL_KNOWN_MAX_AGE_SECONDS + settings.KEY_ROTATION_INTERVAL_SECONDS,
+    )
+    if settings.KEY_ROTATION_ENABLED:
+        await key_rotation_watcher.start()
+    container.register(KeyRotationWatcher, instance=key_rotation_watcher, scope=punq.Scope.singleton)
+
     apps, scopes = load_authoritative_apps()
 
-    container.register(Hash, ImplHash, scope=punq.Scope.singleton)
-    container.register(
-        JWT,
-        instance=ImplJWT(
+    stats_reporter = StatsReporter(interval=settings.STATS_REPORT_INTERVAL_SECONDS)
+    container.register(StatsReporter, instance=stats_reporter, scope=punq.Scope.singleton)
+
+    hash_scheduler = HashScheduler(
+        hash_service=ImplHash(executor=create_executor(settings.HASH_EXECUTOR, settings.HASH_WORKERS)),
+        max_concurrency=settings.HASH_MAX_CONCURRENCY,
+        max_queue_size=settings.HASH_MAX_QUEUE_SIZE,
+        queue_timeout=settings.HASH_QUEUE_TIMEOUT_SECONDS,
+    )
+    stats_reporter.register("hash_scheduler", hash_scheduler.stats.snapshot)
+    container.register(Hash, instance=hash_scheduler, scope=punq.Scope.singleton)
+    if settings.CRYPTO_EXECUTOR == "process":
+        crypto_pool = CryptoPool(
             key_manager=key_manager,
-            algorithm=settings.ALGORITHM,
             issuer=settings.DOMAIN_URL,
             audience=settings.DOMAIN_URL,
-        ),
-        scope=punq.Scope.singleton,
-    )
+            jwe_algorithm=settings.JWE_ALGORITHM,
+            workers=settings.CRYPTO_WORKERS,
+            batch_size=settings.CRYPTO_BATCH_SIZE,
+            batch_delay=settings.CRYPTO_BATCH_DELAY_SECONDS,
+        )
+        container.register(CryptoPool, instance=crypto_pool, scope=punq.Scope.singleton)
+        container.register(JWT, instance=ProcessPoolJWT(pool=crypto_pool), scope=punq.Scope.singleton)
+        container.register(JWE, instance=ProcessPoolJWE(pool=crypto_pool), scope=punq.Scope.singleton)
+    else:
+        container.register(
+            JWT,
+            instance=ImplJWT(
+                key_manager=key_manager,
+                issuer=settings.DOMAIN_URL,
+                audience=settings.DOMAIN_URL,
+            ),
+            scope=punq.Scope.singleton,
+        )
+        container.register(
+            JWE,
+            instance=ImplJWE(key_manager=key_manager, algorithm=settings.JWE_ALGORITHM),
+            scope=punq.Scope.singleton,
+        )
+    container.register(AppScopes, instance=scopes, scope=punq.Scope.singleton)
+    container.register(ScopeRegistry, instance=ScopeRegistry(scopes), scope=punq.Scope.singleton)
     container.register(
-        JWE,
-        instance=ImplJWE(key_manager=key_manager),
+        SessionTokenCodec,
+        instance=SessionTokenCodec(key_manager=key_manager, revalidate_after=settings.SESSION_REVALIDATE_SECONDS),
         scope=punq.Scope.singleton,
     )
-    container.register(AppScopes, instance=scopes, scope=punq.Scope.singleton)
+    session_tokens_cache = SessionTokensCache(
+        maxsize=settings.SESSION_TOKENS_CACHE_SIZE,
+        ttl=settings.SESSION_TOKENS_CACHE_TTL_SECONDS,
+    )
+    stats_reporter.register("session_tokens_cache", session_tokens_cache.stats.snapshot)
+    container.register(SessionTokensCache, instance=session_tokens_cache, scope=punq.Scope.singleton)
+
+    invalid_session_tokens_cache = InvalidSessionTokensCache(
+        maxsize=settings.NEGATIVE_CACHE_SIZE,
+        ttl=settings.NEGATIVE_CACHE_TTL_SECONDS,
+    )
+    stats_reporter.register("invalid_session_tokens_cache", invalid_session_tokens_cache.stats.snapshot)
+    container.register(InvalidSessionTokensCache, instance=invalid_session_tokens_cache, scope=punq.Scope.singleton)
+
+    unknown_client_ids_cache = UnknownClientIdsCache(
+        maxsize=settings.NEGATIVE_CACHE_SIZE,
+        ttl=settings.NEGATIVE_CACHE_TTL_SECONDS,
+    )
+    stats_reporter.register("unknown_client_ids_cache", unknown_client_ids_cache.stats.snapshot)
+    container.register(UnknownClientIdsCache, instance=unknown_client_ids_cache, scope=punq.Scope.singleton)
 
     redis_connection_pool = create_redis_connection_pool()
 
     def get_redis_client() -> Redis:
-        return Redis(connection_pool=redis_connection_pool, decode_responses=True)
+        return Redis(connection_pool=redis_connection_pool)
 
     container.register(Redis, factory=get_redis_client)
 
+    apps_cache = AppsCache(maxsize=settings.APPS_CACHE_SIZE, ttl=settings.APPS_CACHE_TTL_SECONDS)
+    stats_reporter.register("apps_cache", apps_cache.stats.snapshot)
+    container.register(AppsCache, instance=apps_cache, scope=punq.Scope.singleton)
+    apps_cache_invalidator = AppsCacheInvalidator(
+        cache=apps_cache,
+        redis=get_redis_client(),
+        channel=settings.APPS_CACHE_CHANNEL,
+    )
+    await apps_cache_invalidator.start()
+    container.register(AppsCacheInvalidator, instance=apps_cache_invalidator, scope=punq.Scope.singleton)
+
     await init_mongodb()
 
     container.register(IAppsRepository, MongoAppsRepository, scope=punq.Scope.singleton)
     container.register(IOAuth2SessionsRepository, MongoOAuth2SessionsRepository, scope=punq.Scope.singleton)
-    container.register(ISessionsRepository, MongoSessionsRepository, scope=punq.Scope.singleton)
+    if settings.SESSIONS_BACKEND == "redis":
+        container.register(ISessionsRepository, RedisSessionsRepository, scope=punq.Scope.singleton)
+    else:
+        container.register(ISessionsRepository, MongoSessionsRepository, scope=punq.Scope.singleton)
+
+    last_used_buffer = LastUsedBuffer(
+        repository=resolve(container, ISessionsRepository),
+        flush_interval=settings.SESSION_LAST_USED_FLUSH_INTERVAL_SECONDS,
+        max_batch_size=settings.SESSION_LAST_USED_BATCH_SIZE,
+        min_interval=settings.SESSION_LAST_USED_MIN_INTERVAL_SECONDS,
+    )
+    await last_used_buffer.start()
+    container.register(LastUsedBuffer, instance=last_used_buffer, scope=punq.Scope.singleton)
     container.register(IUsersRepository, MongoUsersRepository, scope=punq.Scope.singleton)
     container.register(IAuthReqRepository, AuthorizationRequestsRepository, scope=punq.Scope.singleton)
+    container.register(IssuedTokensCache, scope=punq.Scope.singleton)
 
     container.register(IAppsService, AppsService, scope=punq.Scope.singleton)
     container.register(IAuthService, AuthService, scope=punq.Scope.singleton)
@@ -113,6 +215,7 @@ async def init_container() -> punq.Container:
     container.register(IEmailService, EmailService, scope=punq.Scope.singleton)
     container.register(IAuthReqService, AuthReqService, scope=punq.Scope.singleton)
     container.register(IOAuthSessionsService, OAuthSessionsService, scope=punq.Scope.singleton)
+    container.register(SessionRevocations, scope=punq.Scope.singleton)
     container.register(ISessionsService, SessionsService, scope=punq.Scope.singleton)
     container.register(IUsersService, UsersService, scope=punq.Scope.singleton)
     container.register(WellKnownService, scope=punq.Scope.singleton)
@@ -138,7 +241,25 @@ async def init_container() -> punq.Container:
 
     container.register(GetMeUseCase, scope=punq.Scope.transient)
 
-    container.register(GetOpenIdConfigurationUseCase, scope=punq.Scope.transient)
-    container.register(GetJWKsUseCase, scope=punq.Scope.transient)
+    container.register(GetUserSessionsUseCase, scope=punq.Scope.transient)
+    container.register(GetSessionsByUserIdUseCase, scope=punq.Scope.transient)
+    container.register(RevokeSessionsUseCase, scope=punq.Scope.transient)
+
+    container.register(GetOpenIdConfigurationUseCase, scope=punq.Scope.singleton)
+    container.register(GetJWKsUseCase, scope=punq.Scope.singleton)
+    container.register(GetScopeRegistryUseCase, scope=punq.Scope.singleton)
+
+    if settings.STATS_REPORT_ENABLED:
+        await stats_reporter.start()
 
     return container
+
+
+async def close_container(container: punq.Container) -> None:
+    await resolve(container, KeyRotationWatcher).close()
+    await resolve(container, LastUsedBuffer).close()
+    await resolve(container, AppsCacheInvalidator).close()
+    await resolve(container, StatsReporter).close()
+    resolve(container, Hash).close()
+    if settings.CRYPTO_EXECUTOR == "process":
+        resolve(container, CryptoPool).close()
@@ -16,8 +16,12 @@ def validate_dependency(dependency: type, container: punq.Container) -> None:
         raise Exception(f"Failed to resolve {dependency.__name__}")
 
 
+def resolve[T](container: punq.Container, dependency: type[T]) -> T:
+    return container.resolve(dependency)  # type: ignore
+
+
 def Provide[T](dependency: type[T]) -> T:
     async def _dependency(container: punq.Container = Depends(get_container)) -> T:
-        return container.resolve(dependency)  # type: ignore
+        return resolve(container, dependency)
 
     return params.Depends(_dependency)  # type: ignore
@@ -1,7 +1,7 @@
 from dataclasses import asdict, dataclass, field
 from enum import Enum
 
-from fastapi import Request, status
+from fastapi import HTTPException, Request, status
 from fastapi.responses import ORJSONResponse
 
 
@@ -19,6 +19,8 @@ class ServiceErrorCode(Enum):
     NOT_MATCHING_CONFIGURATION = 11
     INVALID_REDIRECT_URI = 12
     INVALID_REFRESH_TOKEN = 13
+    INVALID_CURSOR = 14
+    INVALID_AUTHORIZATION_REQUEST = 15
 
 
 SERVICE_ERROR_CODE_MESSAGES = {
@@ -30,6 +32,7 @@ SERVICE_ERROR_CODE_MESSAGES = {
     ServiceErrorCode.INSUFFICIENT_PERMISSIONS: "Not enough permissions to perform this action",
     ServiceErrorCode.INVALID_CLIENT_ID: "Invalid client_id",
     ServiceErrorCode.INVALID_CLIENT_CREDENTIALS: "Invalid client credentials",
+    ServiceErrorCode.INVALID_CURSOR: "Invalid cursor",
 }
 
 
@@ -80,6 +83,15 @@ class ServiceError(Exception):
         self.message = get_service_error_code_message(self.code)
 
 
+class ServiceOverloaded(HTTPException):
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is overloaded, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 async def service_error_handler(request: Request, exc: ServiceError) -> ORJSONResponse:
     error_dict = asdict(exc)
     if not exc.errors:
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+import orjson
+from redis.asyncio import Redis
+
+from src.logger import logger
+from src.oauth2.config import settings
+from src.oauth2.dto import TokenResponseDTO
+
+
+def _issued_tokens_key(token_id: UUID) -> str:
+    return f"issued_tokens:{token_id}"
+
+
+@dataclass
+class IssuedTokensCache:
+    redis: Redis
+
+    async def claim(self, token_id: UUID, tokens: TokenResponseDTO) -> TokenResponseDTO:
+        key = _issued_tokens_key(token_id)
+        try:
+            if await self.redis.set(key, orjson.dumps(tokens), nx=True, ex=settings.REFRESH_TOKEN_REUSE_WINDOW_SECONDS):
+                return tokens
+            data = await self.redis.get(key)
+        except Exception:
+            logger.error("Failed to cache issued tokens: ", exc_info=True)
+            return tokens
+
+        if data is None:
+            return tokens
+        return TokenResponseDTO(**orjson.loads(data))
@@ -10,10 +10,12 @@ class Settings(BaseSettings):
         env_prefix="OAUTH2_",
     )
 
-    AUTHORIZATION_CODE_LENGTH: int = 512
+    AUTHORIZATION_CODE_LENGTH: int = 32
     AUTHORIZATION_CODE_EXPIRE_SECONDS: int = 60
     ACCESS_TOKEN_EXPIRE_SECONDS: int = 3600
     REFRESH_TOKEN_EXPIRE_HOURS: int = 24
+    REFRESH_TOKEN_REUSE_WINDOW_SECONDS: int = 10
+    SCOPE_CLAIM_FORMAT: str = "string"
 
 
 settings = Settings()  # type: ignore
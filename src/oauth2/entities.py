@@ -1,21 +1,6 @@
+from dataclasses import dataclass
 from enum import Enum
-
-from pydantic import BaseModel
-
-from src.apps.dto import OAuth2AppInfoDTO
-from src.users.entities import User
-
-
-class AuthorizationRequest(BaseModel):
-    application: OAuth2AppInfoDTO
-    requested_scopes: list[str]
-    redirect_uri: str
-    user: User
-    state: str | None = None
-    nonce: str | None = None
-    code_challenge: str | None = None
-    code_challenge_method: str | None = None
-    prompt: str | None = None
+from uuid import UUID
 
 
 class ResponseType(str, Enum):
@@ -35,3 +20,14 @@ class GrantType(str, Enum):
 
 class CodeChallengeMethod(str, Enum):
     s256 = "S256"
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AuthorizationRequest:
+    user_id: UUID
+    client_id: UUID
+    requested_scopes: list[str]
+    redirect_uri: str
+    state: str | None = None
+    code_challenge: str | None = None
+    code_challenge_method: CodeChallengeMethod | None = None
@@ -21,6 +21,11 @@ class InvalidAuthorizationCode(ServiceError):
         super().__init__(code=ServiceErrorCode.INVALID_AUTHORIZATION_CODE)
 
 
+class InvalidAuthorizationRequest(ServiceError):
+    def __init__(self) -> None:
+        super().__init__(code=ServiceErrorCode.INVALID_AUTHORIZATION_REQUEST)
+
+
 class InvalidClientCredentials(ServiceError):
     def __init__(self) -> None:
         super().__init__(code=ServiceErrorCode.INVALID_CLIENT_CREDENTIALS)
@@ -4,10 +4,12 @@ from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from src.apps.dto import OAuth2AppInfoDTO
+from src.oauth2_sessions.entities import OAuth2Session
 from src.oauth2_sessions.service import IOAuthSessionsService
-from src.schemas import AppScopes, Scope
+from src.schemas import Scope
 from src.services.jwe import JWE
 from src.services.jwt import JWT
+from src.services.scope_registry import ScopeRegistry
 
 from .config import settings
 from .exceptions import (
@@ -18,19 +20,22 @@ from .exceptions import (
 
 class IOAuthService(ABC):
     @abstractmethod
-    def validate_scopes(self, scopes: list[str], req_scopes: list[str]) -> bool: ...
+    def validate_scopes(self, scopes_mask: int, req_scopes: list[str]) -> bool: ...
 
     @abstractmethod
     def get_app_scopes(self) -> list[Scope]: ...
 
     @abstractmethod
-    def create_access_token(self, user_id: UUID, scopes: list[str], client_id: str) -> str: ...
+    def get_requested_scopes(self, req_scopes: list[str]) -> list[Scope]: ...
 
     @abstractmethod
-    def create_refresh_token(self, token_id: UUID) -> str: ...
+    async def create_access_token(self, user_id: UUID, scopes: list[str], client_id: str) -> str: ...
 
     @abstractmethod
-    async def validate_refresh_token(self, refresh_token: str | None): ...
+    async def create_refresh_token(self, token_id: UUID) -> str: ...
+
+    @abstractmethod
+    async def rotate_refresh_token(self, refresh_token: str | None) -> OAuth2Session: ...
 
     @abstractmethod
     def validate_client_credentials(
@@ -41,37 +46,38 @@ class IOAuthService(ABC):
 @dataclass
 class OAuthService:
     sessions_service: IOAuthSessionsService
-    scopes: AppScopes
     jwt: JWT
     jwe: JWE
+    scope_registry: ScopeRegistry
 
-    def validate_scopes(self, scopes: list[str], req_scopes: list[str]) -> bool:
-        for scope in req_scopes:
-            if scope not in scopes:
-                return False
-        return True
+    def validate_scopes(self, scopes_mask: int, req_scopes: list[str]) -> bool:
+        req_mask = self.scope_registry.mask(req_scopes)
+        return req_mask is not None and self.scope_registry.is_subset(req_mask, scopes_mask)
 
     def get_app_scopes(self) -> list[Scope]:
-        return self.scopes.root
+        return self.scope_registry.scopes
 
-    def create_access_token(self, user_id: UUID, scopes: list[str], client_id: str) -> str:
-        return self.jwt.encode(
+    def get_requested_scopes(self, req_scopes: list[str]) -> list[Scope]:
+        return self.scope_registry.get_scopes(self.scope_registry.known_mask(req_scopes))
+
+    async def create_access_token(self, user_id: UUID, scopes: list[str], client_id: str) -> str:
+        return await self.jwt.encode(
             payload={
                 "sub": user_id,
-                "scope": ", ".join(scopes),
+                **self._scope_claim(scopes),
                 "aud": client_id,
                 "exp": datetime.now(UTC) + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS),
             }
         )
 
-    def create_refresh_token(self, token_id: UUID) -> str:
-        return self.jwe.encode(token_id.bytes)
+    async def create_refresh_token(self, token_id: UUID) -> str:
+        return await self.jwe.encode(token_id.bytes)
 
-    async def validate_refresh_token(self, refresh_token: str | None):
+    async def rotate_refresh_token(self, refresh_token: str | None) -> OAuth2Session:
         if not refresh_token:
             raise InvalidRefreshToken
 
-        jwe = self.jwe.decode(refresh_token)
+        jwe = await self.jwe.decode(refresh_token)
         if not jwe:
             raise InvalidRefreshToken
         try:
@@ -79,11 +85,16 @@ class OAuthService:
         except ValueError:
             raise InvalidRefreshToken
 
-        session = await self.sessions_service.get_by_token_id(token_id)
+        session = await self.sessions_service.rotate_token_id(token_id)
         if not session:
             raise InvalidRefreshToken
         return session
 
+    def _scope_claim(self, scopes: list[str]) -> dict[str, str]:
+        if settings.SCOPE_CLAIM_FORMAT == "compact":
+            return {"scp": self.scope_registry.encode(self.scope_registry.known_mask(scopes))}
+        return {"scope": ", ".join(scopes)}
+
     def validate_client_credentials(self, app: OAuth2AppInfoDTO, username: str | None, password: str | None) -> None:
         try:
             client_id = UUID(username)
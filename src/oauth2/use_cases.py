@@ -6,6 +6,8 @@ from src.auth.exceptions import InvalidSession
 from src.auth.service import IAuthService
 from src.oauth2.exceptions import (
     InvalidAuthorizationCode,
+    InvalidAuthorizationRequest,
+    InvalidClientCredentials,
     InvalidClientId,
     InvalidCodeVerifier,
     InvalidRedirectUri,
@@ -17,6 +19,7 @@ from src.oauth2_sessions.service import IOAuthSessionsService
 from src.schemas import Scope
 from src.services.oauth_auth_requests import IAuthReqService
 
+from .cache import IssuedTokensCache
 from .config import settings
 from .dto import RequestValidateResponseDTO, TokenResponseDTO
 from .entities import AuthorizationRequest, CodeChallengeMethod, GrantType, ResponseType
@@ -66,8 +69,7 @@ class OAuthRequestUseCase:
         )
 
     def get_requested_scopes(self, scopes: list[str]) -> list[Scope]:
-        app_scopes = self.oauth_service.get_app_scopes()
-        return [scope for scope in app_scopes if scope.name in scopes]
+        return self.oauth_service.get_requested_scopes(scopes)
 
 
 
@@ -91,6 +93,7 @@ class OAuthAuthorizeUseCase:
     apps_service: IAppsService
     requests_service: IAuthReqService
     command: OAuthAuthorizeCommand = field(init=False)
+    session_token: str | None = field(init=False, default=None)
 
     async def execute(self, command: OAuthAuthorizeCommand) -> RedirectUri | WebMessage:
         self.command = command
@@ -102,15 +105,15 @@ class OAuthAuthorizeUseCase:
             raise NotMatchingConfiguration
 
         try:
-            user, _ = await self.auth_service.validate_session(command.session_token)
+            user, _, self.session_token = await self.auth_service.authenticate(command.session_token)
         except InvalidSession:
             return await self._handle_error("login_required")
 
-        if not self.oauth_service.validate_scopes(application.scopes, command.scope):
+        if not self.oauth_service.validate_scopes(application.scopes_mask, command.scope):
             return await self._handle_error("invalid_scope")
 
         if command.response_type == ResponseType.token:
-            access_token = self.oauth_service.create_access_token(
+            access_token = await self.oauth_service.create_access_token(
                 user_id=user.id,
                 scopes=self.command.scope,
                 client_id=str(self.command.client_id),
@@ -118,17 +121,18 @@ class OAuthAuthorizeUseCase:
             return self.token(access_token)
 
         new_request = AuthorizationRequest(
-            application=application,
+            user_id=user.id,
+            client_id=application.client_id,
             requested_scopes=command.scope,
             redirect_uri=command.redirect_uri,
-            user=user,
             state=command.state,
-            nonce=None,
             code_challenge=command.code_challenge,
             code_challenge_method=command.code_challenge_method,
-            prompt=None,
         )
-        code = await self.requests_service.create_new_request(new_request)
+        try:
+            code = await self.requests_service.create_new_request(new_request)
+        except InvalidAuthorizationRequest:
+            return await self._handle_error("invalid_request")
 
         if command.response_type == ResponseType.code:
             return self.code(code)
@@ -184,6 +188,8 @@ class OAuthTokenUseCase:
     oauth_service: OAuthService
     sessions_service: IOAuthSessionsService
     requests_service: IAuthReqService
+    apps_service: IAppsService
+    issued_tokens: IssuedTokensCache
 
     async def execute(self, command: OAuthTokenCommand) -> TokenResponseDTO:
         if command.grant_type == GrantType.refresh_token:
@@ -194,14 +200,14 @@ class OAuthTokenUseCase:
         raise NotImplementedError
 
     async def _execute_refresh_token(self, command: OAuthTokenCommand) -> TokenResponseDTO:
-        session = await self.oauth_service.validate_refresh_token(command.refresh_token)
-        token_id = await self.sessions_service.update_token_id(session_id=session.id)
-        return self.create_tokens(
+        session = await self.oauth_service.rotate_refresh_token(command.refresh_token)
+        tokens = await self.create_tokens(
             user_id=session.user_id,
             scopes=session.scopes,
             client_id=session.client_id,
-            token_id=token_id,
+            token_id=session.token_id,
         )
+        return await self.issued_tokens.claim(session.token_id, tokens)
 
     async def _execute_token_exchange(self, command: OAuthTokenCommand) -> TokenResponseDTO:
         if not command.code:
@@ -223,29 +229,34 @@ class OAuthTokenUseCase:
             ):
                 raise InvalidCodeVerifier
         else:
-            self.oauth_service.validate_client_credentials(req.application, command.username, command.password)
+            application = await self.apps_service.get_by_client_id(req.client_id)
+            if not application:
+                raise InvalidClientCredentials
+            self.oauth_service.validate_client_credentials(application, command.username, command.password)
 
         session = await self.sessions_service.create_new_session(
             CreateOAuth2SessionDTO(
-                user_id=req.user.id,
-                client_id=req.application.client_id,
+                user_id=req.user_id,
+                client_id=req.client_id,
                 scopes=req.requested_scopes,
             )
         )
-        return self.create_tokens(
-            user_id=req.user.id,
+        return await self.create_tokens(
+            user_id=req.user_id,
             scopes=req.requested_scopes,
-            client_id=req.application.client_id,
+            client_id=req.client_id,
             token_id=session.token_id,
         )
 
-    def create_tokens(self, user_id: UUID, scopes: list[str], client_id: UUID, token_id: UUID) -> TokenResponseDTO:
-        access_token = self.oauth_service.create_access_token(
+    async def create_tokens(
+        self, user_id: UUID, scopes: list[str], client_id: UUID, token_id: UUID
+    ) -> TokenResponseDTO:
+        access_token = await self.oauth_service.create_access_token(
             user_id=user_id,
             scopes=scopes,
             client_id=str(client_id),
         )
-        refresh_token = self.oauth_service.create_refresh_token(token_id)
+        refresh_token = await self.oauth_service.create_refresh_token(token_id)
 
         return TokenResponseDTO(
             access_token=access_token,
@@ -18,6 +18,7 @@ from src.oauth2.use_cases import (
 )
 from src.schemas import Scope
 from src.sessions.dependencies import SessionCookie
+from src.sessions.utils import set_session_cookie
 
 from .dependencies import AppAuth
 from .schemas import CodeExchangeResponseSchema, OAuthRequestValidateResponseSchema
@@ -83,15 +84,19 @@ async def oauth2_authorize(
         )
     )
     if isinstance(res, RedirectUri):
-        return RedirectResponse(url=res.build(), status_code=status.HTTP_200_OK)
+        response = RedirectResponse(url=res.build(), status_code=status.HTTP_200_OK)
     elif isinstance(res, WebMessage):
-        response = res.build()
-        return HTMLResponse(
-            content=response.content,
-            headers=response.headers,
+        message = res.build()
+        response = HTMLResponse(
+            content=message.content,
+            headers=message.headers,
         )
+    else:
+        raise NotImplementedError
 
-    raise NotImplementedError
+    if use_case.session_token is not None:
+        set_session_cookie(use_case.session_token, res=response)
+    return response
 
 
 @router.post("/token", response_model=CodeExchangeResponseSchema)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from uuid import UUID
 
 
@@ -7,3 +8,10 @@ class CreateOAuth2SessionDTO:
     user_id: UUID
     client_id: UUID
     scopes: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class OAuth2SessionsFilterDTO:
+    user_ids: list[UUID] | None = None
+    client_id: UUID | None = None
+    created_before: datetime | None = None
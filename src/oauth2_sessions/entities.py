@@ -11,6 +11,8 @@ class OAuth2SessionFields:
     scopes: list[str]
     last_refresh: datetime
     created_at: datetime
+    expires_at: datetime
+    previous_token_id: UUID | None = None
 
 
 @dataclass(kw_only=True)
@@ -1,20 +1,24 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Annotated
 from uuid import UUID, uuid4
 
-from beanie import Document
-from pydantic import Field
+from beanie import Document, Indexed
+from pydantic import BaseModel, Field
 
+from src.oauth2.config import settings
 from src.oauth2_sessions.entities import OAuth2Session, OAuth2SessionFields
 
 
 class OAuth2SessionODM(Document):
     id: UUID = Field(default_factory=uuid4)  # type: ignore
-    user_id: UUID
-    client_id: UUID
-    token_id: UUID
+    user_id: Annotated[UUID, Indexed()]
+    client_id: Annotated[UUID, Indexed()]
+    token_id: Annotated[UUID, Indexed(unique=True)]
+    previous_token_id: Annotated[UUID | None, Indexed()] = None
     scopes: list[str]
     last_refresh: datetime
-    created_at: datetime
+    created_at: Annotated[datetime, Indexed()]
+    expires_at: Annotated[datetime | None, Indexed(expireAfterSeconds=0)] = None
 
     @classmethod
     def from_fields(cls, entity: "OAuth2SessionFields"):
@@ -22,9 +26,11 @@ class OAuth2SessionODM(Document):
             user_id=entity.user_id,
             client_id=entity.client_id,
             token_id=entity.token_id,
+            previous_token_id=entity.previous_token_id,
             scopes=entity.scopes,
             last_refresh=entity.last_refresh,
             created_at=entity.created_at,
+            expires_at=entity.expires_at,
         )
 
     def to_entity(self) -> "OAuth2Session":
@@ -33,7 +39,13 @@ class OAuth2SessionODM(Document):
             user_id=self.user_id,
             client_id=self.client_id,
             token_id=self.token_id,
+            previous_token_id=self.previous_token_id,
             scopes=self.scopes,
             last_refresh=self.last_refresh,
             created_at=self.created_at,
+            expires_at=self.expires_at or self.last_refresh + timedelta(hours=settings.REFRESH_TOKEN_EXPIRE_HOURS),
         )
+
+
+class OAuth2SessionIdProjection(BaseModel):
+    id: UUID = Field(alias="_id")
@@ -1,9 +1,18 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
 from uuid import UUID
 
+from beanie import UpdateResponse
+from beanie.odm.queries.find import FindMany
+from beanie.operators import GT, GTE, LT, And, Eq, In, Or, Set
+
+from src.oauth2.config import settings
+
+from .dto import OAuth2SessionsFilterDTO
 from .entities import OAuth2Session, OAuth2SessionFields
-from .models import OAuth2SessionODM
+from .models import OAuth2SessionIdProjection, OAuth2SessionODM
 
 
 class IOAuth2SessionsRepository(ABC):
@@ -17,9 +26,9 @@ class IOAuth2SessionsRepository(ABC):
     async def get_by_token_id(self, token_id: UUID) -> OAuth2Session | None: ...
 
     @abstractmethod
-    async def update_token_id_and_last_refresh(
-        self, session_id: UUID, token_id: UUID, last_refresh: datetime
-    ) -> None: ...
+    async def rotate_token_id(
+        self, token_id: UUID, new_token_id: UUID, last_refresh: datetime, expires_at: datetime, reuse_since: datetime
+    ) -> OAuth2Session | None: ...
 
     @abstractmethod
     async def delete_session(self, session_id: UUID) -> OAuth2Session | None: ...
@@ -27,6 +36,9 @@ class IOAuth2SessionsRepository(ABC):
     @abstractmethod
     async def delete_sessions(self, user_id: UUID) -> None: ...
 
+    @abstractmethod
+    def delete_many(self, filter: OAuth2SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]: ...
+
 
 class MongoOAuth2SessionsRepository(IOAuth2SessionsRepository):
     async def add(self, session: OAuth2SessionFields) -> OAuth2Session:
@@ -46,14 +58,25 @@ class MongoOAuth2SessionsRepository(IOAuth2SessionsRepository):
             return None
         return session.to_entity()
 
-    async def update_token_id_and_last_refresh(self, session_id: UUID, token_id: UUID, last_refresh: datetime) -> None:
-        session = await OAuth2SessionODM.find_one(OAuth2SessionODM.id == session_id)
+    async def rotate_token_id(
+        self, token_id: UUID, new_token_id: UUID, last_refresh: datetime, expires_at: datetime, reuse_since: datetime
+    ) -> OAuth2Session | None:
+        session = await OAuth2SessionODM.find_one(*rotation_filter(token_id, last_refresh)).update(  # pyright: ignore[reportGeneralTypeIssues]
+            Set(
+                {
+                    OAuth2SessionODM.token_id: new_token_id,
+                    OAuth2SessionODM.previous_token_id: token_id,
+                    OAuth2SessionODM.last_refresh: last_refresh,
+                    OAuth2SessionODM.expires_at: expires_at,
+                }
+            ),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
         if session is None:
-            raise Exception("Session not found")
-
-        session.token_id = token_id
-        session.last_refresh = last_refresh
-        await session.save()
+            session = await OAuth2SessionODM.find_one(*reuse_filter(token_id, last_refresh, reuse_since))
+        if session is None:
+            return None
+        return session.to_entity()
 
     async def delete_session(self, session_id: UUID) -> None:
         session = await OAuth2SessionODM.find_one(OAuth2SessionODM.id == session_id)
@@ -63,3 +86,48 @@ class MongoOAuth2SessionsRepository(IOAuth2SessionsRepository):
 
     async def delete_sessions(self, user_id: UUID) -> None:
         await OAuth2SessionODM.find_many(OAuth2SessionODM.user_id == user_id).delete()
+
+    async def delete_many(self, filter: OAuth2SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        while True:
+            sessions = (
+                await find_oauth2_sessions_query(filter).limit(batch_size).project(OAuth2SessionIdProjection).to_list()
+            )
+            if not sessions:
+                return
+
+            session_ids = [session.id for session in sessions]
+            await OAuth2SessionODM.find_many(In(OAuth2SessionODM.id, session_ids)).delete()
+            yield session_ids
+
+
+def rotation_filter(token_id: UUID, now: datetime) -> tuple[Any, ...]:
+    return OAuth2SessionODM.token_id == token_id, not_expired_filter(now)
+
+
+def reuse_filter(token_id: UUID, now: datetime, reuse_since: datetime) -> tuple[Any, ...]:
+    return (
+        OAuth2SessionODM.previous_token_id == token_id,
+        GTE(OAuth2SessionODM.last_refresh, reuse_since),
+        not_expired_filter(now),
+    )
+
+
+def not_expired_filter(now: datetime) -> Or:
+    return Or(
+        GT(OAuth2SessionODM.expires_at, now),
+        And(
+            Eq(OAuth2SessionODM.expires_at, None),
+            GT(OAuth2SessionODM.last_refresh, now - timedelta(hours=settings.REFRESH_TOKEN_EXPIRE_HOURS)),
+        ),
+    )
+
+
+def find_oauth2_sessions_query(filter: OAuth2SessionsFilterDTO) -> FindMany[OAuth2SessionODM]:
+    query = OAuth2SessionODM.find_many()
+    if filter.user_ids is not None:
+        query = query.find(In(OAuth2SessionODM.user_id, filter.user_ids))
+    if filter.client_id is not None:
+        query = query.find(OAuth2SessionODM.client_id == filter.client_id)
+    if filter.created_before is not None:
+        query = query.find(LT(OAuth2SessionODM.created_at, filter.created_before))
+    return query
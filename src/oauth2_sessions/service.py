@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID, uuid4
 
-from src.oauth2_sessions.dto import CreateOAuth2SessionDTO
+from src.oauth2.config import settings
+from src.oauth2_sessions.dto import CreateOAuth2SessionDTO, OAuth2SessionsFilterDTO
 from src.oauth2_sessions.entities import OAuth2Session, OAuth2SessionFields
 
 from .repository import IOAuth2SessionsRepository
@@ -20,7 +22,7 @@ class IOAuthSessionsService(ABC):
     async def create_new_session(self, dto: CreateOAuth2SessionDTO) -> OAuth2Session: ...
 
     @abstractmethod
-    async def update_token_id(self, session_id: UUID) -> UUID: ...
+    async def rotate_token_id(self, token_id: UUID) -> OAuth2Session | None: ...
 
     @abstractmethod
     async def delete(self, session_id: UUID) -> None: ...
@@ -28,6 +30,9 @@ class IOAuthSessionsService(ABC):
     @abstractmethod
     async def delete_all_by_user_id(self, user_id: UUID) -> None: ...
 
+    @abstractmethod
+    def revoke_many(self, filter: OAuth2SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]: ...
+
 
 @dataclass(kw_only=True)
 class OAuthSessionsService(IOAuthSessionsService):
@@ -42,6 +47,7 @@ class OAuthSessionsService(IOAuthSessionsService):
                 token_id=uuid4(),
                 last_refresh=datetime.now(),
                 created_at=datetime.now(),
+                expires_at=datetime.now() + timedelta(hours=settings.REFRESH_TOKEN_EXPIRE_HOURS),
             )
         )
 
@@ -51,13 +57,21 @@ class OAuthSessionsService(IOAuthSessionsService):
     async def get_by_token_id(self, token_id: UUID) -> OAuth2Session | None:
         return await self.repository.get_by_token_id(token_id)
 
-    async def update_token_id(self, session_id: UUID) -> UUID:
-        new_token_id = uuid4()
-        await self.repository.update_token_id_and_last_refresh(session_id, new_token_id, datetime.now())
-        return new_token_id
+    async def rotate_token_id(self, token_id: UUID) -> OAuth2Session | None:
+        now = datetime.now()
+        return await self.repository.rotate_token_id(
+            token_id,
+            uuid4(),
+            last_refresh=now,
+            expires_at=now + timedelta(hours=settings.REFRESH_TOKEN_EXPIRE_HOURS),
+            reuse_since=now - timedelta(seconds=settings.REFRESH_TOKEN_REUSE_WINDOW_SECONDS),
+        )
 
     async def delete(self, session_id: UUID) -> None:
         await self.repository.delete_session(session_id)
 
     async def delete_all_by_user_id(self, user_id: UUID) -> None:
         await self.repository.delete_sessions(user_id)
+
+    def revoke_many(self, filter: OAuth2SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        return self.repository.delete_many(filter, batch_size)
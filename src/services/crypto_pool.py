@@ -0,0 +1,200 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from src.logger import logger
+from src.services.jwe import JWE, ImplJWE
+from src.services.jwt import JWT, ImplJWT
+from src.services.key_manager import KeyManager
+from src.utils import create_key_pairs
+
+_worker_jwt: ImplJWT | None = None
+_worker_jwe: ImplJWE | None = None
+
+
+def _init_worker(
+    certs: list[str],
+    staged_certs: list[str],
+    retired_certs: list[str],
+    issuer: str,
+    audience: str,
+    algorithm: str,
+    jwe_algorithm: str,
+) -> None:
+    global _worker_jwt, _worker_jwe
+
+    key_manager = KeyManager(
+        key_pairs=create_key_pairs(certs),
+        rsa_algorithm=algorithm,
+        retired_key_pairs=create_key_pairs(retired_certs),
+        staged_key_pairs=create_key_pairs(staged_certs),
+    )
+    _worker_jwt = ImplJWT(key_manager=key_manager, issuer=issuer, audience=audience)
+    _worker_jwe = ImplJWE(key_manager=key_manager, algorithm=jwe_algorithm)
+
+
+def _get_operation(name: str) -> Callable[..., Any]:
+    assert _worker_jwt is not None and _worker_jwe is not None, "Crypto worker was not initialized"
+    operations: dict[str, Callable[..., Any]] = {
+        "sign": _worker_jwt.sign,
+        "verify": _worker_jwt.verifier.verify,
+        "encrypt": _worker_jwe.encrypt,
+        "decrypt": _worker_jwe.decrypt,
+    }
+    return operations[name]
+
+
+def _run_batch(batch: list[tuple[str, tuple[Any, ...]]]) -> list[tuple[bool, Any]]:
+    results: list[tuple[bool, Any]] = []
+    for name, args in batch:
+        try:
+            results.append((True, _get_operation(name)(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _resolve_batch(futures: list[asyncio.Future], result: asyncio.Future) -> None:
+    if result.cancelled():
+        for future in futures:
+            future.cancel()
+        return
+
+    exc = result.exception()
+    if exc is not None:
+        for future in futures:
+            if not future.done():
+                future.set_exception(exc)
+        return
+
+    for future, (ok, value) in zip(futures, result.result(), strict=True):
+        if future.done():
+            continue
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+
+class CryptoPool:
+    def __init__(
+        self,
+        key_manager: KeyManager,
+        issuer: str,
+        audience: str,
+        jwe_algorithm: str,
+        workers: int,
+        batch_size: int,
+        batch_delay: float,
+    ) -> None:
+        self.key_manager = key_manager
+        self.issuer = issuer
+        self.audience = audience
+        self.jwe_algorithm = jwe_algorithm
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.executor = self._create_executor()
+        self.key_manager.subscribe(self.reload)
+        self._batch: list[tuple[str, tuple[Any, ...], asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def submit(self, operation: str, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((operation, args, future))
+
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+
+        return await future
+
+    def reload(self) -> None:
+        executor, self.executor = self.executor, self._create_executor()
+        executor.shutdown(wait=False)
+
+    def close(self) -> None:
+        self._flush()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        certs, staged_certs, retired_certs = self.key_manager.export_certs()
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                certs,
+                staged_certs,
+                retired_certs,
+                self.issuer,
+                self.audience,
+                self.key_manager.rsa_algorithm,
+                self.jwe_algorithm,
+            ),
+        )
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        operations = [(operation, args) for operation, args, _ in batch]
+        futures = [future for _, _, future in batch]
+        executor = self.executor
+        try:
+            result = asyncio.wrap_future(executor.submit(_run_batch, operations))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, BrokenProcessPool):
+                self._recover(executor)
+            return
+
+        result.add_done_callback(partial(_resolve_batch, futures))
+        result.add_done_callback(partial(self._check_broken, executor))
+
+    def _check_broken(self, executor: ProcessPoolExecutor, result: asyncio.Future) -> None:
+        if not result.cancelled() and isinstance(result.exception(), BrokenProcessPool):
+            self._recover(executor)
+
+    def _recover(self, executor: ProcessPoolExecutor) -> None:
+        if self.executor is not executor:
+            return
+        logger.error("Crypto worker pool is broken, restarting it")
+        self.executor = self._create_executor()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class ProcessPoolJWT(JWT):
+    pool: CryptoPool
+
+    async def encode(self, payload: dict[str, Any]) -> str:
+        return await self.pool.submit("sign", payload)
+
+    async def decode(self, token: str, audience: str | None = None) -> dict[str, Any] | None:
+        return await self.pool.submit("verify", token, audience)
+
+
+@dataclass
+class ProcessPoolJWE(JWE):
+    pool: CryptoPool
+
+    async def encode(self, data: bytes) -> str:
+        return await self.pool.submit("encrypt", data)
+
+    async def decode(self, token: str) -> bytes | None:
+        return await self.pool.submit("decrypt", token)
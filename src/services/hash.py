@@ -1,29 +1,133 @@
+import asyncio
+import multiprocessing
+import time
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
 import bcrypt
 
+from src.exceptions import ServiceOverloaded
+
 
 class Hash(ABC):
     @abstractmethod
-    def create(self, value: str | bytes) -> bytes: ...
+    async def create(self, value: str | bytes) -> bytes: ...
 
     @abstractmethod
-    def check(self, value: str | bytes, hashed_value: bytes) -> bool: ...
+    async def check(self, value: str | bytes, hashed_value: bytes) -> bool: ...
+
+    def close(self) -> None:
+        return None
+
+
+def create_executor(kind: str, max_workers: int) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hash")
+    elif kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def _to_bytes(value: str | bytes) -> bytes:
+    if isinstance(value, str):
+        return value.encode()
+    elif not isinstance(value, bytes):
+        raise ValueError("Value must be either str or bytes.")
+    return value
 
 
+def _hashpw(value: bytes) -> bytes:
+    return bcrypt.hashpw(password=value, salt=bcrypt.gensalt())
+
+
+def _checkpw(value: bytes, hashed_value: bytes) -> bool:
+    return bcrypt.checkpw(password=value, hashed_password=hashed_value)
+
+
+@dataclass
 class ImplHash(Hash):
-    def create(self, value: str | bytes) -> bytes:
-        if isinstance(value, str):
-            value = value.encode()
-        elif not isinstance(value, bytes):
-            raise ValueError("Value must be either str or bytes.")
+    executor: Executor
+
+    async def create(self, value: str | bytes) -> bytes:
+        value = _to_bytes(value)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _hashpw, value)
+
+    async def check(self, value: str | bytes, hashed_value: bytes) -> bool:
+        value = _to_bytes(value)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _checkpw, value, hashed_value)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass(slots=True)
+class HashSchedulerStats:
+    in_flight: int = 0
+    queue_depth: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def snapshot(self) -> dict[str, int | float]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_seconds": self.total_wait_seconds / self.admitted if self.admitted else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+class HashScheduler(Hash):
+    def __init__(self, hash_service: Hash, max_concurrency: int, max_queue_size: int, queue_timeout: float) -> None:
+        self.hash_service = hash_service
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.stats = HashSchedulerStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def create(self, value: str | bytes) -> bytes:
+        async with self._admit():
+            return await self.hash_service.create(value)
+
+    async def check(self, value: str | bytes, hashed_value: bytes) -> bool:
+        async with self._admit():
+            return await self.hash_service.check(value, hashed_value)
+
+    def close(self) -> None:
+        self.hash_service.close()
 
-        return bcrypt.hashpw(password=value, salt=bcrypt.gensalt())
+    @asynccontextmanager
+    async def _admit(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self.stats.queue_depth >= self.max_queue_size:
+            self.stats.rejected += 1
+            raise ServiceOverloaded(retry_after=max(1, round(self.queue_timeout)))
 
-    def check(self, value: str | bytes, hashed_value: bytes) -> bool:
-        if isinstance(value, str):
-            value = value.encode()
-        elif not isinstance(value, bytes):
-            raise ValueError("Value must be either str or bytes.")
+        started_at = time.monotonic()
+        self.stats.queue_depth += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self.stats.timed_out += 1
+            raise ServiceOverloaded(retry_after=max(1, round(self.queue_timeout)))
+        finally:
+            self.stats.queue_depth -= 1
 
-        return bcrypt.checkpw(password=value, hashed_password=hashed_value)
+        waited = time.monotonic() - started_at
+        self.stats.admitted += 1
+        self.stats.total_wait_seconds += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+        self.stats.in_flight += 1
+        try:
+            yield
+        finally:
+            self.stats.in_flight -= 1
+            self._semaphore.release()
@@ -5,39 +5,76 @@ from jwcrypto import jwe
 
 from src.services.key_manager import KeyManager
 
+RSA_ALGORITHM = "RSA-OAEP-256"
+RSA_ENCRYPTION = "A256CBC-HS512"
+EC_ALGORITHM = "ECDH-ES+A256KW"
+EC_ENCRYPTION = "A256GCM"
+DIRECT_ALGORITHM = "dir"
+DIRECT_ENCRYPTION = "A256GCM"
+
+ALLOWED_ALGORITHMS = [RSA_ALGORITHM, RSA_ENCRYPTION, EC_ALGORITHM, EC_ENCRYPTION, DIRECT_ALGORITHM, DIRECT_ENCRYPTION]
+
 
 class JWE(ABC):
     @abstractmethod
-    def encode(self, data: bytes) -> str: ...
+    async def encode(self, data: bytes) -> str: ...
 
     @abstractmethod
-    def decode(self, token: str) -> bytes | None: ...
+    async def decode(self, token: str) -> bytes | None: ...
 
 
 @dataclass
 class ImplJWE(JWE):
     key_manager: KeyManager
+    algorithm: str = RSA_ALGORITHM
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in (RSA_ALGORITHM, DIRECT_ALGORITHM):
+            raise ValueError(f"Unsupported JWE algorithm: {self.algorithm}")
+        if self.algorithm == RSA_ALGORITHM and not self.key_manager.encryption_keys:
+            raise ValueError(f"{RSA_ALGORITHM} requires at least one RSA or EC key")
+
+    async def encode(self, data: bytes) -> str:
+        return self.encrypt(data)
+
+    async def decode(self, token: str) -> bytes | None:
+        return self.decrypt(token)
 
-    def encode(self, data: bytes) -> str:
-        key_pair = self.key_manager.get_random_key_pair()
-        kid = key_pair.private_key.thumbprint()
-        protected_header = {"alg": "RSA-OAEP-256", "enc": "A256CBC-HS512", "typ": "JWE", "kid": kid}
-        jwetoken = jwe.JWE(data, recipient=key_pair.public_key, protected=protected_header)
+    def encrypt(self, data: bytes) -> str:
+        if self.algorithm == DIRECT_ALGORITHM:
+            key = self.key_manager.get_random_key()
+            protected_header = {
+                "alg": DIRECT_ALGORITHM,
+                "enc": DIRECT_ENCRYPTION,
+                "typ": "JWE",
+                "kid": key.symmetric_kid,
+            }
+            jwetoken = jwe.JWE(data, recipient=key.symmetric_key, protected=protected_header)
+        else:
+            key = self.key_manager.get_random_encryption_key()
+            if key.kty == "EC":
+                protected_header = {"alg": EC_ALGORITHM, "enc": EC_ENCRYPTION, "typ": "JWE", "kid": key.kid}
+            else:
+                protected_header = {"alg": RSA_ALGORITHM, "enc": RSA_ENCRYPTION, "typ": "JWE", "kid": key.kid}
+            jwetoken = jwe.JWE(data, recipient=key.key_pair.public_key, protected=protected_header)
         return jwetoken.serialize(compact=True)
 
-    def decode(self, token: str) -> bytes | None:
+    def decrypt(self, token: str) -> bytes | None:
         try:
-            jwetoken = jwe.JWE()
+            jwetoken = jwe.JWE(algs=ALLOWED_ALGORITHMS)
             jwetoken.deserialize(token)
             kid = jwetoken.jose_header.get("kid")
             if not kid:
                 return None
 
-            private_key = self.key_manager.private_keys_by_kid.get(kid)
-            if not private_key:
+            if jwetoken.jose_header.get("alg") == DIRECT_ALGORITHM:
+                key = self.key_manager.symmetric_keys_by_kid.get(kid)
+            else:
+                key = self.key_manager.private_keys_by_kid.get(kid)
+            if not key:
                 return None
 
-            jwetoken.decrypt(key=private_key)
+            jwetoken.decrypt(key=key)
             return jwetoken.payload
         except Exception:
             return None
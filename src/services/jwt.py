@@ -1,20 +1,24 @@
 import json
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 from uuid import UUID
 
 import jwt
+import orjson
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_decode
 
 from src.services.key_manager import KeyManager
 
 
 class JWT(ABC):
     @abstractmethod
-    def encode(self, payload: dict[str, Any]) -> str: ...
+    async def encode(self, payload: dict[str, Any]) -> str: ...
 
     @abstractmethod
-    def decode(self, token: str) -> dict[str, Any] | None: ...
+    async def decode(self, token: str, audience: str | None = None) -> dict[str, Any] | None: ...
 
 
 class UUIDEncoder(json.JSONEncoder):
@@ -24,34 +28,85 @@ class UUIDEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+@dataclass
+class JWTVerifier:
+    key_manager: KeyManager
+    issuer: str
+    leeway: int = 0
+    _algorithms: dict[str, Any] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._algorithms = get_default_algorithms()
+
+    def verify(self, token: str, audience: str | None = None) -> dict[str, Any] | None:
+        try:
+            signing_input, _, signature_segment = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            header = orjson.loads(base64url_decode(header_segment))
+            key = self.key_manager.keys_by_kid.get(header.get("kid"))
+            if not key or header.get("alg") != key.algorithm:
+                return None
+
+            signature = base64url_decode(signature_segment)
+            if not self._algorithms[key.algorithm].verify(signing_input.encode(), key.verifying_key, signature):
+                return None
+
+            payload = orjson.loads(base64url_decode(payload_segment))
+        except Exception:
+            return None
+
+        if not isinstance(payload, dict) or not self._validate_claims(payload, audience):
+            return None
+        return payload
+
+    def _validate_claims(self, payload: dict[str, Any], audience: str | None) -> bool:
+        if payload.get("iss") != self.issuer:
+            return False
+
+        now = time.time()
+        exp = payload.get("exp")
+        if not isinstance(exp, int | float) or exp + self.leeway <= now:
+            return False
+
+        nbf = payload.get("nbf")
+        if nbf is not None and (not isinstance(nbf, int | float) or nbf - self.leeway > now):
+            return False
+
+        if audience is not None:
+            aud = payload.get("aud")
+            if isinstance(aud, str):
+                return aud == audience
+            if isinstance(aud, list):
+                return audience in aud
+            return False
+
+        return True
+
+
 @dataclass
 class ImplJWT(JWT):
     key_manager: KeyManager
     issuer: str
     audience: str
-    algorithm: str
+    verifier: JWTVerifier = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.verifier = JWTVerifier(key_manager=self.key_manager, issuer=self.issuer)
+
+    async def encode(self, payload: dict[str, Any]) -> str:
+        return self.sign(payload)
 
-    def encode(self, payload: dict[str, Any]) -> str:
-        key_pair = self.key_manager.get_random_key_pair()
-        kid = key_pair.private_key.thumbprint()
+    async def decode(self, token: str, audience: str | None = None) -> dict[str, Any] | None:
+        return self.verifier.verify(token, audience=audience)
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        key = self.key_manager.get_random_key()
         payload["iss"] = self.issuer
         token = jwt.encode(
             payload=payload,
-            key=key_pair.private_key.export_to_pem(private_key=True, password=None),  # type: ignore
+            key=key.signing_key,
             json_encoder=UUIDEncoder,
-            algorithm=self.algorithm,
-            headers={"kid": kid},
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
         )
         return token
-
-    def decode(self, token: str) -> dict[str, Any] | None:
-        unverified_headers = jwt.get_unverified_header(token)
-        kid = unverified_headers.get("kid")
-        if not kid:
-            return None
-
-        public_key = self.key_manager.public_keys_by_kid.get(kid)
-        if not public_key:
-            return None
-
-        return jwt.decode(token, key=public_key.export_to_pem(), algorithms=[self.algorithm], issuer=self.issuer)
@@ -1,13 +1,250 @@
 import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from jwcrypto import jwk
+from jwcrypto.common import base64url_encode
 
 from src.schemas import KeyPair
 
+SYMMETRIC_KEY_INFO = b"auth-service jwe dir A256GCM"
+
+EC_ALGORITHMS = {"P-256": "ES256", "P-384": "ES384", "P-521": "ES512"}
+OKP_ALGORITHMS = {"Ed25519": "EdDSA", "Ed448": "EdDSA"}
+
+
+def get_key_type(key: jwk.JWK) -> str:
+    kty = key.get("kty")
+    if not isinstance(kty, str):
+        raise ValueError("Key has no key type")
+    return kty
+
+
+def get_signing_algorithm(key: jwk.JWK, rsa_algorithm: str) -> str:
+    kty = get_key_type(key)
+    crv = key.get("crv")
+    if kty == "RSA":
+        return rsa_algorithm
+    elif kty == "EC" and isinstance(crv, str) and crv in EC_ALGORITHMS:
+        return EC_ALGORITHMS[crv]
+    elif kty == "OKP" and isinstance(crv, str) and crv in OKP_ALGORITHMS:
+        return OKP_ALGORITHMS[crv]
+    raise ValueError(f"Unsupported key type: {kty} {crv or ''}".strip())
+
+
+def export_private_pem(private_key: jwk.JWK) -> bytes:
+    return private_key.export_to_pem(private_key=True, password=None)  # pyright: ignore[reportArgumentType]
+
+
+def derive_symmetric_key(private_key: jwk.JWK, kid: str) -> jwk.JWK:
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=SYMMETRIC_KEY_INFO)
+    secret = hkdf.derive(export_private_pem(private_key))
+    return jwk.JWK(kty="oct", k=base64url_encode(secret), kid=kid)
+
+
+@dataclass(frozen=True, slots=True)
+class ManagedKey:
+    kid: str
+    kty: str
+    algorithm: str
+    key_pair: KeyPair
+    signing_key: Any
+    verifying_key: Any
+    symmetric_kid: str
+    symmetric_key: jwk.JWK
+
+    @classmethod
+    def from_key_pair(cls, key_pair: KeyPair, rsa_algorithm: str = "RS256") -> "ManagedKey":
+        kid = key_pair.private_key.thumbprint()
+        symmetric_kid = f"{kid}-dir"
+        return cls(
+            kid=kid,
+            kty=get_key_type(key_pair.private_key),
+            algorithm=get_signing_algorithm(key_pair.private_key, rsa_algorithm),
+            key_pair=key_pair,
+            signing_key=key_pair.private_key.get_op_key("sign"),
+            verifying_key=key_pair.public_key.get_op_key("verify"),
+            symmetric_kid=symmetric_kid,
+            symmetric_key=derive_symmetric_key(key_pair.private_key, symmetric_kid),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class KeySet:
+    active_keys: list[ManagedKey]
+    retired_keys: list[ManagedKey]
+    staged_keys: list[ManagedKey] = field(default_factory=list)
+    keys: list[ManagedKey] = field(init=False)
+    encryption_keys: list[ManagedKey] = field(init=False)
+    algorithms: list[str] = field(init=False)
+    keys_by_kid: dict[str, ManagedKey] = field(init=False)
+    public_keys_by_kid: dict[str, jwk.JWK] = field(init=False)
+    private_keys_by_kid: dict[str, jwk.JWK] = field(init=False)
+    symmetric_keys_by_kid: dict[str, jwk.JWK] = field(init=False)
+
+    def __post_init__(self) -> None:
+        keys = self.active_keys + self.staged_keys + self.retired_keys
+        object.__setattr__(self, "keys", keys)
+        object.__setattr__(self, "encryption_keys", [key for key in self.active_keys if key.kty in ("RSA", "EC")])
+        object.__setattr__(self, "algorithms", sorted({key.algorithm for key in keys}))
+        object.__setattr__(self, "keys_by_kid", {key.kid: key for key in keys})
+        object.__setattr__(self, "public_keys_by_kid", {key.kid: key.key_pair.public_key for key in keys})
+        object.__setattr__(self, "private_keys_by_kid", {key.kid: key.key_pair.private_key for key in keys})
+        object.__setattr__(self, "symmetric_keys_by_kid", {key.symmetric_kid: key.symmetric_key for key in keys})
+
 
 class KeyManager:
-    def __init__(self, key_pairs: list[KeyPair]):
-        self.key_pairs = key_pairs
-        self.public_keys_by_kid = {key.private_key.thumbprint(): key.public_key for key in key_pairs}
-        self.private_keys_by_kid = {key.private_key.thumbprint(): key.private_key for key in key_pairs}
+    def __init__(
+        self,
+        key_pairs: list[KeyPair],
+        rsa_algorithm: str = "RS256",
+        retired_key_pairs: list[KeyPair] | None = None,
+        require_encryption_keys: bool = False,
+        staged_key_pairs: list[KeyPair] | None = None,
+    ):
+        self.rsa_algorithm = rsa_algorithm
+        self.require_encryption_keys = require_encryption_keys
+        self.key_set = KeySet(
+            active_keys=[ManagedKey.from_key_pair(key_pair, rsa_algorithm) for key_pair in key_pairs],
+            retired_keys=[ManagedKey.from_key_pair(key_pair, rsa_algorithm) for key_pair in retired_key_pairs or []],
+            staged_keys=[ManagedKey.from_key_pair(key_pair, rsa_algorithm) for key_pair in staged_key_pairs or []],
+        )
+        self.validate(self.key_set)
+        now = time.monotonic()
+        self._desired_keys = self.key_set.active_keys + self.key_set.staged_keys
+        self._staged_at = {key.kid: now for key in self.key_set.staged_keys}
+        self._retired_at = {key.kid: now for key in self.key_set.retired_keys}
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def key_pairs(self) -> list[KeyPair]:
+        return [key.key_pair for key in self.key_set.active_keys]
+
+    @property
+    def keys(self) -> list[ManagedKey]:
+        return self.key_set.keys
+
+    @property
+    def encryption_keys(self) -> list[ManagedKey]:
+        return self.key_set.encryption_keys
+
+    @property
+    def algorithms(self) -> list[str]:
+        return self.key_set.algorithms
+
+    @property
+    def keys_by_kid(self) -> dict[str, ManagedKey]:
+        return self.key_set.keys_by_kid
+
+    @property
+    def public_keys_by_kid(self) -> dict[str, jwk.JWK]:
+        return self.key_set.public_keys_by_kid
+
+    @property
+    def private_keys_by_kid(self) -> dict[str, jwk.JWK]:
+        return self.key_set.private_keys_by_kid
+
+    @property
+    def symmetric_keys_by_kid(self) -> dict[str, jwk.JWK]:
+        return self.key_set.symmetric_keys_by_kid
 
     def get_random_key_pair(self) -> KeyPair:
-        return random.choice(self.key_pairs)
+        return self.get_random_key().key_pair
+
+    def get_random_key(self) -> ManagedKey:
+        return random.choice(self.key_set.active_keys)
+
+    def get_random_encryption_key(self) -> ManagedKey:
+        return random.choice(self.key_set.encryption_keys)
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def rotate(self, key_pairs: list[KeyPair], grace_period: float, activation_delay: float = 0) -> None:
+        current = self.key_set
+        desired_keys = []
+        for key_pair in key_pairs:
+            key = current.keys_by_kid.get(key_pair.private_key.thumbprint())
+            desired_keys.append(key or ManagedKey.from_key_pair(key_pair, self.rsa_algorithm))
+        self.validate(KeySet(active_keys=desired_keys, retired_keys=[]))
+
+        now = time.monotonic()
+        active_kids = {key.kid for key in current.active_keys}
+        staged_at = {}
+        for key in desired_keys:
+            if key.kid in self._staged_at:
+                staged_at[key.kid] = self._staged_at[key.kid]
+            elif key.kid not in active_kids:
+                staged_at[key.kid] = now
+        self._update(desired_keys, staged_at, grace_period, activation_delay, now)
+
+    def refresh(self, grace_period: float, activation_delay: float = 0) -> None:
+        self._update(self._desired_keys, self._staged_at, grace_period, activation_delay, time.monotonic())
+
+    def export_certs(self) -> tuple[list[str], list[str], list[str]]:
+        return (
+            [_export_pem(key) for key in self.key_set.active_keys],
+            [_export_pem(key) for key in self.key_set.staged_keys],
+            [_export_pem(key) for key in self.key_set.retired_keys],
+        )
+
+    def validate(self, key_set: KeySet) -> None:
+        if not key_set.active_keys:
+            raise ValueError("Key set must contain at least one active key")
+        if self.require_encryption_keys and not key_set.encryption_keys:
+            raise ValueError("Key set must contain at least one active RSA or EC key for encryption")
+
+    def _update(
+        self,
+        desired_keys: list[ManagedKey],
+        staged_at: dict[str, float],
+        grace_period: float,
+        activation_delay: float,
+        now: float,
+    ) -> None:
+        current = self.key_set
+        staged_at = {kid: at for kid, at in staged_at.items() if at + activation_delay > now}
+        active_keys = [key for key in desired_keys if key.kid not in staged_at]
+        staged_keys = [key for key in desired_keys if key.kid in staged_at]
+        if staged_keys:
+            desired_kids = {key.kid for key in desired_keys}
+            active_keys += [key for key in current.active_keys if key.kid not in desired_kids]
+
+        active_kids = {key.kid for key in active_keys}
+        retired_at = dict(self._retired_at)
+        for key in current.active_keys:
+            if key.kid not in active_kids:
+                retired_at[key.kid] = now
+        for kid in active_kids:
+            retired_at.pop(kid, None)
+        retired_at = {kid: at for kid, at in retired_at.items() if at + grace_period > now}
+
+        retired_keys = [key for key in current.keys if key.kid in retired_at]
+        key_set = KeySet(active_keys=active_keys, retired_keys=retired_keys, staged_keys=staged_keys)
+        self.validate(key_set)
+
+        self._desired_keys = desired_keys
+        self._staged_at = staged_at
+        self._retired_at = retired_at
+        if _kids(key_set) == _kids(current):
+            return
+
+        self.key_set = key_set
+        for listener in self._listeners:
+            listener()
+
+
+def _kids(key_set: KeySet) -> tuple[list[str], list[str], list[str]]:
+    return (
+        [key.kid for key in key_set.active_keys],
+        [key.kid for key in key_set.staged_keys],
+        [key.kid for key in key_set.retired_keys],
+    )
+
+
+def _export_pem(key: ManagedKey) -> str:
+    return export_private_pem(key.key_pair.private_key).decode()
@@ -0,0 +1,69 @@
+import asyncio
+import glob
+import os
+
+from src.logger import logger
+from src.services.key_manager import KeyManager
+from src.utils import create_key_pairs, load_certs
+
+
+class KeyRotationWatcher:
+    def __init__(
+        self,
+        key_manager: KeyManager,
+        cert_dir: str,
+        interval: float,
+        grace_period: float,
+        activation_delay: float = 0,
+    ) -> None:
+        self.key_manager = key_manager
+        self.cert_dir = cert_dir
+        self.interval = interval
+        self.grace_period = grace_period
+        self.activation_delay = activation_delay
+        self._snapshot: dict[str, tuple[int, int]] = {}
+        self._task: asyncio.Task | None = None
+
+    def snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for cert_path in glob.glob(os.path.join(self.cert_dir, "*.pem")):
+            stat = os.stat(cert_path)
+            snapshot[cert_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    async def start(self) -> None:
+        self._snapshot = await asyncio.to_thread(self.snapshot)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def check(self) -> None:
+        snapshot = await asyncio.to_thread(self.snapshot)
+        if snapshot != self._snapshot:
+            certs = await asyncio.to_thread(load_certs, self.cert_dir)
+            key_pairs = await asyncio.to_thread(create_key_pairs, certs)
+            self.key_manager.rotate(key_pairs, grace_period=self.grace_period, activation_delay=self.activation_delay)
+            self._snapshot = snapshot
+            logger.info(
+                "Rotated keys, active kids: %s, staged kids: %s",
+                [key.kid for key in self.key_manager.key_set.active_keys],
+                [key.kid for key in self.key_manager.key_set.staged_keys],
+            )
+
+        self.key_manager.refresh(grace_period=self.grace_period, activation_delay=self.activation_delay)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.error("Failed to rotate keys: ", exc_info=True)
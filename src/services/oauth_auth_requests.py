@@ -1,11 +1,14 @@
+import struct
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from uuid import UUID
 
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 
 from src.oauth2.config import settings
-from src.oauth2.entities import AuthorizationRequest
-from src.oauth2.exceptions import InvalidAuthorizationCode
+from src.oauth2.entities import AuthorizationRequest, CodeChallengeMethod
+from src.oauth2.exceptions import InvalidAuthorizationCode, InvalidAuthorizationRequest
 from src.oauth2.utils import gen_authorization_code
 
 
@@ -17,19 +20,108 @@ class IAuthReqRepository(ABC):
     async def get(self, key: str) -> AuthorizationRequest | None: ...
 
 
+AUTHORIZATION_REQUEST_VERSION = 1
+AUTHORIZATION_REQUEST_HEADER = struct.Struct("!B16s16sBBHHHH")
+CODE_CHALLENGE_METHODS: tuple[CodeChallengeMethod | None, ...] = (None, CodeChallengeMethod.s256)
+MAX_FIELD_LENGTH = 0xFFFF
+
+HAS_STATE = 1
+HAS_CODE_CHALLENGE = 2
+
+
+def dump_authorization_request(req: AuthorizationRequest) -> bytes:
+    redirect_uri = req.redirect_uri.encode()
+    scopes = " ".join(req.requested_scopes).encode()
+    state = req.state.encode() if req.state is not None else b""
+    code_challenge = req.code_challenge.encode() if req.code_challenge is not None else b""
+    if max(len(redirect_uri), len(scopes), len(state), len(code_challenge)) > MAX_FIELD_LENGTH:
+        raise InvalidAuthorizationRequest
+
+    flags = (HAS_STATE if req.state is not None else 0) | (HAS_CODE_CHALLENGE if req.code_challenge is not None else 0)
+    header = AUTHORIZATION_REQUEST_HEADER.pack(
+        AUTHORIZATION_REQUEST_VERSION,
+        req.user_id.bytes,
+        req.client_id.bytes,
+        flags,
+        CODE_CHALLENGE_METHODS.index(req.code_challenge_method),
+        len(redirect_uri),
+        len(scopes),
+        len(state),
+        len(code_challenge),
+    )
+    return b"".join((header, redirect_uri, scopes, state, code_challenge))
+
+
+def load_authorization_request(data: bytes | str) -> AuthorizationRequest | None:
+    if not isinstance(data, bytes):
+        return None
+    try:
+        (
+            version,
+            user_id,
+            client_id,
+            flags,
+            method,
+            redirect_uri_len,
+            scopes_len,
+            state_len,
+            code_challenge_len,
+        ) = AUTHORIZATION_REQUEST_HEADER.unpack_from(data)
+        if version != AUTHORIZATION_REQUEST_VERSION:
+            return None
+
+        view = memoryview(data)[AUTHORIZATION_REQUEST_HEADER.size :]
+        if len(view) != redirect_uri_len + scopes_len + state_len + code_challenge_len:
+            return None
+        redirect_uri, view = bytes(view[:redirect_uri_len]).decode(), view[redirect_uri_len:]
+        scopes, view = bytes(view[:scopes_len]).decode(), view[scopes_len:]
+        state, view = bytes(view[:state_len]).decode(), view[state_len:]
+        code_challenge = bytes(view).decode()
+        return AuthorizationRequest(
+            user_id=UUID(bytes=user_id),
+            client_id=UUID(bytes=client_id),
+            requested_scopes=scopes.split(" ") if scopes else [],
+            redirect_uri=redirect_uri,
+            state=state if flags & HAS_STATE else None,
+            code_challenge=code_challenge if flags & HAS_CODE_CHALLENGE else None,
+            code_challenge_method=CODE_CHALLENGE_METHODS[method],
+        )
+    except (struct.error, IndexError, UnicodeDecodeError):
+        return None
+
+
+GETDEL_SCRIPT = """
+local value = redis.call("GET", KEYS[1])
+if value then
+    redis.call("DEL", KEYS[1])
+end
+return value
+"""
+
+
 @dataclass
 class AuthorizationRequestsRepository(IAuthReqRepository):
     redis: Redis
+    getdel_supported: bool = field(default=True, init=False)
 
     async def add(self, key: str, req: AuthorizationRequest) -> None:
-        await self.redis.set(key, req.model_dump_json(), ex=settings.AUTHORIZATION_CODE_EXPIRE_SECONDS)
+        await self.redis.set(key, dump_authorization_request(req), ex=settings.AUTHORIZATION_CODE_EXPIRE_SECONDS)
 
     async def get(self, key: str) -> AuthorizationRequest | None:
-        data = await self.redis.get(key)
-        if not data:
+        data = await self._getdel(key)
+        if data is None:
             return None
-        await self.redis.delete(key)
-        return AuthorizationRequest.model_validate_json(data)
+        return load_authorization_request(data)
+
+    async def _getdel(self, key: str) -> bytes | str | None:
+        if self.getdel_supported:
+            try:
+                return await self.redis.getdel(key)
+            except ResponseError as e:
+                if "unknown command" not in str(e).lower():
+                    raise
+                self.getdel_supported = False
+        return await self.redis.eval(GETDEL_SCRIPT, 1, key)  # pyright: ignore[reportGeneralTypeIssues]
 
 
 class IAuthReqService(ABC):
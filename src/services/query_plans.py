@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from beanie import Document
+from beanie.odm.queries.find import FindMany
+from beanie.operators import In
+
+from src.apps.models import AppODM
+from src.logger import logger
+from src.oauth2_sessions.dto import OAuth2SessionsFilterDTO
+from src.oauth2_sessions.models import OAuth2SessionODM
+from src.oauth2_sessions.repository import find_oauth2_sessions_query, reuse_filter, rotation_filter
+from src.sessions.dto import SessionsCursor, SessionsFilterDTO
+from src.sessions.models import SessionODM
+from src.sessions.repository import find_sessions_query, sessions_page_query
+from src.users.models import UserODM
+
+
+@dataclass(frozen=True, slots=True)
+class QueryShape:
+    name: str
+    model: type[Document]
+    filter: Mapping[str, Any]
+    sort: list[tuple[str, int]] | None = None
+
+    @classmethod
+    def from_query(cls, name: str, query: FindMany[Any]) -> "QueryShape":
+        return cls(
+            name=name,
+            model=query.document_model,
+            filter=query.get_filter_query(),
+            sort=[(key, int(direction)) for key, direction in query.sort_expressions] or None,
+        )
+
+
+def get_query_shapes() -> list[QueryShape]:
+    now = datetime.now()
+    return [
+        QueryShape.from_query("users by id", UserODM.find(UserODM.id == uuid4())),
+        QueryShape.from_query("users by email", UserODM.find(UserODM.email == "")),
+        QueryShape.from_query("users by username", UserODM.find(UserODM.username == "")),
+        QueryShape.from_query("sessions by id", SessionODM.find(SessionODM.id == uuid4())),
+        QueryShape.from_query("sessions by ids", SessionODM.find(In(SessionODM.id, [uuid4()]))),
+        QueryShape.from_query("sessions by user_id", SessionODM.find(SessionODM.user_id == uuid4())),
+        QueryShape.from_query("sessions first page by user_id", sessions_page_query(uuid4())),
+        QueryShape.from_query(
+            "sessions next page by user_id",
+            sessions_page_query(uuid4(), SessionsCursor(last_used=now, id=uuid4())),
+        ),
+        QueryShape.from_query(
+            "sessions by user_ids",
+            find_sessions_query(SessionsFilterDTO(user_ids=[uuid4()])),
+        ),
+        QueryShape.from_query(
+            "sessions by ip_address",
+            find_sessions_query(SessionsFilterDTO(ip_address="")),
+        ),
+        QueryShape.from_query(
+            "sessions by expires_before",
+            find_sessions_query(SessionsFilterDTO(expires_before=now)),
+        ),
+        QueryShape.from_query("oauth2 sessions by id", OAuth2SessionODM.find(OAuth2SessionODM.id == uuid4())),
+        QueryShape.from_query("oauth2 sessions by ids", OAuth2SessionODM.find(In(OAuth2SessionODM.id, [uuid4()]))),
+        QueryShape.from_query(
+            "oauth2 sessions by token_id",
+            OAuth2SessionODM.find(OAuth2SessionODM.token_id == uuid4()),
+        ),
+        QueryShape.from_query(
+            "oauth2 sessions rotation by token_id",
+            OAuth2SessionODM.find(*rotation_filter(uuid4(), now)),
+        ),
+        QueryShape.from_query(
+            "oauth2 sessions reuse by previous_token_id",
+            OAuth2SessionODM.find(*reuse_filter(uuid4(), now, now)),
+        ),
+        QueryShape.from_query(
+            "oauth2 sessions by user_id",
+            OAuth2SessionODM.find(OAuth2SessionODM.user_id == uuid4()),
+        ),
+        QueryShape.from_query(
+            "oauth2 sessions by user_ids",
+            find_oauth2_sessions_query(OAuth2SessionsFilterDTO(user_ids=[uuid4()])),
+        ),
+        QueryShape.from_query(
+            "oauth2 sessions by client_id",
+            find_oauth2_sessions_query(OAuth2SessionsFilterDTO(client_id=uuid4())),
+        ),
+        QueryShape.from_query(
+            "oauth2 sessions by created_before",
+            find_oauth2_sessions_query(OAuth2SessionsFilterDTO(created_before=now)),
+        ),
+        QueryShape.from_query("apps by id", AppODM.find(AppODM.id == uuid4())),
+        QueryShape.from_query("apps by client_id", AppODM.find(AppODM.client_id == uuid4())),
+        QueryShape.from_query("apps by creator_id", AppODM.find(AppODM.creator_id == uuid4())),
+    ]
+
+
+def has_collscan(plan: Any) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(has_collscan(value) for value in plan.values())
+    elif isinstance(plan, list):
+        return any(has_collscan(value) for value in plan)
+    return False
+
+
+async def check_query_plans(mode: str) -> list[str]:
+    if mode == "off":
+        return []
+
+    collscans = []
+    for shape in get_query_shapes():
+        explain = await shape.model.get_motor_collection().find(shape.filter, sort=shape.sort).explain()
+        if has_collscan(explain["queryPlanner"]["winningPlan"]):
+            collscans.append(shape.name)
+
+    if collscans:
+        message = f"Queries fall back to a collection scan: {', '.join(collscans)}"
+        if mode == "fail":
+            raise RuntimeError(message)
+        logger.warning(message)
+    return collscans
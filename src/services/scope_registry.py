@@ -0,0 +1,53 @@
+import base64
+from collections.abc import Iterable
+
+from src.schemas import AppScopes, Scope
+
+
+class ScopeRegistry:
+    def __init__(self, scopes: AppScopes) -> None:
+        self.scopes: list[Scope] = list(scopes.root)
+        self.names = [scope.name for scope in self.scopes]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Scope names must be unique")
+        self.bits = {name: 1 << position for position, name in enumerate(self.names)}
+        self.all = (1 << len(self.names)) - 1
+
+    def mask(self, names: Iterable[str]) -> int | None:
+        mask = 0
+        for name in names:
+            bit = self.bits.get(name)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def known_mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bits.get(name, 0)
+        return mask
+
+    def is_subset(self, mask: int, allowed: int) -> bool:
+        return mask & ~allowed == 0
+
+    def get_scopes(self, mask: int) -> list[Scope]:
+        scopes = []
+        while mask:
+            bit = mask & -mask
+            scopes.append(self.scopes[bit.bit_length() - 1])
+            mask ^= bit
+        return scopes
+
+    def get_names(self, mask: int) -> list[str]:
+        return [scope.name for scope in self.get_scopes(mask)]
+
+    def encode(self, mask: int) -> str:
+        data = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "big")
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+    def decode(self, value: str) -> int:
+        mask = int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)), "big")
+        if mask & ~self.all:
+            raise ValueError("Scope claim contains unknown scopes")
+        return mask
@@ -0,0 +1,44 @@
+import asyncio
+from collections.abc import Callable, Mapping
+
+from src.logger import logger
+
+type StatsSource = Callable[[], Mapping[str, int | float]]
+
+
+class StatsReporter:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.sources: dict[str, StatsSource] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, name: str, source: StatsSource) -> None:
+        self.sources[name] = source
+
+    def collect(self) -> dict[str, dict[str, int | float]]:
+        return {name: dict(source()) for name, source in self.sources.items()}
+
+    def report(self) -> None:
+        for name, stats in self.collect().items():
+            logger.info("%s stats: %s", name, " ".join(f"{key}={value}" for key, value in stats.items()))
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.report()
+            except Exception:
+                logger.error("Failed to report stats: ", exc_info=True)
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from src.logger import logger
+from src.sessions.entities import Session
+from src.sessions.repository import ISessionsRepository
+
+
+class LastUsedBuffer:
+    def __init__(
+        self,
+        repository: ISessionsRepository,
+        flush_interval: float,
+        max_batch_size: int,
+        min_interval: float = 0,
+    ) -> None:
+        self.repository = repository
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.min_interval = timedelta(seconds=min_interval)
+        self._pending: dict[UUID, datetime] = {}
+        self._task: asyncio.Task | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, session: Session, last_used: datetime) -> None:
+        if self.min_interval and last_used - session.last_used < self.min_interval:
+            return
+
+        self._pending[session.id] = last_used
+        if len(self._pending) >= self.max_batch_size and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._safe_flush())
+
+    def discard(self, session_id: UUID) -> None:
+        self._pending.pop(session_id, None)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+
+            batch = self._pending
+            self._pending = {}
+            try:
+                await self.repository.bulk_update_last_used(batch)
+            except Exception:
+                for session_id, last_used in batch.items():
+                    self._pending.setdefault(session_id, last_used)
+                raise
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._safe_flush()
+
+    async def _safe_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            logger.error("Failed to flush session last_used updates: ", exc_info=True)
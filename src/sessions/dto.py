@@ -1,8 +1,37 @@
 from dataclasses import dataclass
+from datetime import datetime
 from uuid import UUID
 
+from src.sessions.entities import Session
+
 
 @dataclass(frozen=True, slots=True)
 class CreateSessionDTO:
     user_id: UUID
     ip_address: str
+
+
+@dataclass(frozen=True, slots=True)
+class SessionsCursor:
+    last_used: datetime
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class SessionsPageDTO:
+    items: list[Session]
+    next_cursor: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class SessionsFilterDTO:
+    user_ids: list[UUID] | None = None
+    ip_address: str | None = None
+    expires_before: datetime | None = None
+
+
+@dataclass(slots=True)
+class RevocationProgressDTO:
+    sessions: int = 0
+    oauth2_sessions: int = 0
+    done: bool = False
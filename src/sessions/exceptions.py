@@ -0,0 +1,6 @@
+from src.exceptions import ServiceError, ServiceErrorCode
+
+
+class InvalidCursor(ServiceError):
+    def __init__(self) -> None:
+        super().__init__(code=ServiceErrorCode.INVALID_CURSOR)
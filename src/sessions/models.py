@@ -1,8 +1,10 @@
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID, uuid4
 
-from beanie import Document
-from pydantic import Field
+from beanie import Document, Indexed
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from src.sessions.entities import Session, SessionFields
 
@@ -11,8 +13,13 @@ class SessionODM(Document):
     id: UUID = Field(default_factory=uuid4)  # type: ignore
     user_id: UUID
     last_used: datetime
-    ip_address: str
-    expires_at: datetime
+    ip_address: Annotated[str, Indexed()]
+    expires_at: Annotated[datetime, Indexed(expireAfterSeconds=0)]
+
+    class Settings:
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("last_used", DESCENDING), ("_id", DESCENDING)]),
+        ]
 
     @classmethod
     def from_fields(cls, entity: "SessionFields") -> "SessionODM":
@@ -31,3 +38,14 @@ class SessionODM(Document):
             ip_address=self.ip_address,
             expires_at=self.expires_at,
         )
+
+
+class SessionProjection(BaseModel):
+    id: UUID = Field(alias="_id")
+    last_used: datetime
+    ip_address: str
+    expires_at: datetime
+
+
+class SessionIdProjection(BaseModel):
+    id: UUID = Field(alias="_id")
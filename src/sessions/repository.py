@@ -1,8 +1,21 @@
+import time
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from src.sessions.models import SessionODM
+from beanie import BulkWriter
+from beanie.odm.queries.find import FindMany
+from beanie.operators import LT, And, In, Or, Set
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+
+from src.sessions.dto import SessionsCursor, SessionsFilterDTO
+from src.sessions.models import SessionIdProjection, SessionODM, SessionProjection
+from src.users.entities import User
+from src.users.models import UserODM
 
 from .entities import Session, SessionFields
 
@@ -14,15 +27,43 @@ class ISessionsRepository(ABC):
     @abstractmethod
     async def get_by_id(self, session_id: UUID) -> Session | None: ...
 
+    @abstractmethod
+    async def get_by_id_with_user(self, session_id: UUID) -> tuple[Session, User] | None: ...
+
+    @abstractmethod
+    async def get_by_user_id(self, user_id: UUID, limit: int, after: SessionsCursor | None = None) -> list[Session]: ...
+
     @abstractmethod
     async def update_last_used(self, session_id: UUID, last_used: datetime) -> None: ...
 
+    @abstractmethod
+    async def bulk_update_last_used(self, updates: dict[UUID, datetime]) -> None: ...
+
     @abstractmethod
     async def delete_session(self, session_id: UUID) -> Session | None: ...
 
     @abstractmethod
     async def delete_all_session_by_user_id(self, user_id: UUID) -> None: ...
 
+    @abstractmethod
+    def delete_many(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]: ...
+
+
+SESSION_WITH_USER_PROJECTION = {
+    "user_id": 1,
+    "last_used": 1,
+    "ip_address": 1,
+    "expires_at": 1,
+    "user._id": 1,
+    "user.username": 1,
+    "user.email": 1,
+    "user.email_verified": 1,
+    "user.hashed_password": 1,
+    "user.image_url": 1,
+    "user.active": 1,
+    "user.created_at": 1,
+}
+
 
 class MongoSessionsRepository(ISessionsRepository):
     async def add(self, session: SessionFields) -> Session:
@@ -36,13 +77,57 @@ class MongoSessionsRepository(ISessionsRepository):
             return None
         return session_model.to_entity()
 
+    async def get_by_id_with_user(self, session_id: UUID) -> tuple[Session, User] | None:
+        result = await (
+            SessionODM.find(SessionODM.id == session_id)
+            .aggregate(
+                [
+                    {"$limit": 1},
+                    {
+                        "$lookup": {
+                            "from": UserODM.get_motor_collection().name,
+                            "localField": "user_id",
+                            "foreignField": "_id",
+                            "as": "user",
+                        }
+                    },
+                    {"$unwind": "$user"},
+                    {"$project": SESSION_WITH_USER_PROJECTION},
+                ]
+            )
+            .to_list()
+        )
+        if not result:
+            return None
+
+        user = result[0].pop("user")
+        return SessionODM.model_validate(result[0]).to_entity(), UserODM.model_validate(user).to_entity()
+
+    async def get_by_user_id(self, user_id: UUID, limit: int, after: SessionsCursor | None = None) -> list[Session]:
+        sessions = await sessions_page_query(user_id, after).limit(limit).project(SessionProjection).to_list()
+        return [
+            Session(
+                id=session.id,
+                user_id=user_id,
+                last_used=session.last_used,
+                ip_address=session.ip_address,
+                expires_at=session.expires_at,
+            )
+            for session in sessions
+        ]
+
     async def update_last_used(self, session_id: UUID, last_used: datetime) -> None:
-        session = await SessionODM.find_one(SessionODM.id == session_id)
-        if session is None:
+        result = await SessionODM.find_one(SessionODM.id == session_id).update(Set({SessionODM.last_used: last_used}))  # pyright: ignore[reportGeneralTypeIssues]
+        if result.matched_count == 0:
             raise Exception("Session not found")
 
-        session.last_used = last_used
-        await session.save()
+    async def bulk_update_last_used(self, updates: dict[UUID, datetime]) -> None:
+        async with BulkWriter() as bulk_writer:
+            for session_id, last_used in updates.items():
+                await SessionODM.find_one(  # pyright: ignore[reportGeneralTypeIssues]
+                    SessionODM.id == session_id,
+                    SessionODM.last_used < last_used,
+                ).update(Set({SessionODM.last_used: last_used}), bulk_writer=bulk_writer)
 
     async def delete_session(self, session_id: UUID) -> None:
         session = await SessionODM.find_one(SessionODM.id == session_id)
@@ -53,3 +138,285 @@ class MongoSessionsRepository(ISessionsRepository):
 
     async def delete_all_session_by_user_id(self, user_id: UUID) -> None:
         await SessionODM.find_many(SessionODM.user_id == user_id).delete()
+
+    async def delete_many(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        while True:
+            sessions = await find_sessions_query(filter).limit(batch_size).project(SessionIdProjection).to_list()
+            if not sessions:
+                return
+
+            session_ids = [session.id for session in sessions]
+            await SessionODM.find_many(In(SessionODM.id, session_ids)).delete()
+            yield session_ids
+
+
+def sessions_page_query(user_id: UUID, after: SessionsCursor | None = None) -> FindMany[SessionODM]:
+    query = SessionODM.find(SessionODM.user_id == user_id)
+    if after is not None:
+        query = query.find(  # pyright: ignore[reportCallIssue]
+            Or(
+                SessionODM.last_used < after.last_used,  # pyright: ignore[reportArgumentType]
+                And(SessionODM.last_used == after.last_used, SessionODM.id < after.id),  # pyright: ignore[reportArgumentType]
+            )
+        )
+    return query.sort(-SessionODM.last_used, -SessionODM.id)  # pyright: ignore[reportOperatorIssue]
+
+
+def find_sessions_query(filter: SessionsFilterDTO) -> FindMany[SessionODM]:
+    query = SessionODM.find_many()
+    if filter.user_ids is not None:
+        query = query.find(In(SessionODM.user_id, filter.user_ids))
+    if filter.ip_address is not None:
+        query = query.find(SessionODM.ip_address == filter.ip_address)
+    if filter.expires_before is not None:
+        query = query.find(LT(SessionODM.expires_at, filter.expires_before))
+    return query
+
+
+UPDATE_LAST_USED_SCRIPT = """
+local fields = redis.call("HMGET", KEYS[1], "last_used", "user_id")
+local last_used = fields[1]
+if not last_used then
+    return 0
+end
+if last_used < ARGV[1] then
+    redis.call("HSET", KEYS[1], "last_used", ARGV[1])
+    redis.call("ZADD", ARGV[3] .. fields[2], "XX", ARGV[2], ARGV[4])
+end
+return 1
+"""
+
+USER_SESSIONS_BY_LAST_USED_PREFIX = "user_sessions_by_last_used:"
+
+
+def _session_key(session_id: UUID | str) -> str:
+    return f"session:{session_id}"
+
+
+def _user_sessions_key(user_id: UUID | str) -> str:
+    return f"user_sessions:{user_id}"
+
+
+def _user_sessions_by_last_used_key(user_id: UUID | str) -> str:
+    return f"{USER_SESSIONS_BY_LAST_USED_PREFIX}{user_id}"
+
+
+def _last_used_score(value: datetime) -> int:
+    return round(value.timestamp() * 1_000_000)
+
+
+def _to_str(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _dump_datetime(value: datetime) -> str:
+    return value.isoformat(timespec="microseconds")
+
+
+def _dump_session(session: Session) -> dict[str, str]:
+    return {
+        "user_id": str(session.user_id),
+        "last_used": _dump_datetime(session.last_used),
+        "ip_address": session.ip_address,
+        "expires_at": _dump_datetime(session.expires_at),
+    }
+
+
+def _load_session(session_id: UUID, data: dict) -> Session:
+    fields = {_to_str(key): _to_str(value) for key, value in data.items()}
+    return Session(
+        id=session_id,
+        user_id=UUID(fields["user_id"]),
+        last_used=datetime.fromisoformat(fields["last_used"]),
+        ip_address=fields["ip_address"],
+        expires_at=datetime.fromisoformat(fields["expires_at"]),
+    )
+
+
+@dataclass
+class RedisSessionsRepository(ISessionsRepository):
+    redis: Redis
+    _update_last_used_script: AsyncScript = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._update_last_used_script = self.redis.register_script(UPDATE_LAST_USED_SCRIPT)
+
+    async def add(self, session: SessionFields) -> Session:
+        entity = Session(
+            id=uuid4(),
+            user_id=session.user_id,
+            last_used=session.last_used,
+            ip_address=session.ip_address,
+            expires_at=session.expires_at,
+        )
+        key = _session_key(entity.id)
+        index_key = _user_sessions_key(entity.user_id)
+        last_used_index_key = _user_sessions_by_last_used_key(entity.user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=_dump_session(entity))
+            pipe.expireat(key, entity.expires_at)
+            pipe.zremrangebyscore(index_key, "-inf", time.time())
+            pipe.zadd(index_key, {str(entity.id): entity.expires_at.timestamp()})
+            pipe.zadd(last_used_index_key, {str(entity.id): _last_used_score(entity.last_used)})
+            for expiring_key in (index_key, last_used_index_key):
+                pipe.expireat(expiring_key, entity.expires_at, nx=True)
+                pipe.expireat(expiring_key, entity.expires_at, gt=True)
+            await pipe.execute()
+        return entity
+
+    async def get_by_id(self, session_id: UUID) -> Session | None:
+        data = await self.redis.hgetall(_session_key(session_id))  # pyright: ignore[reportGeneralTypeIssues]
+        if not data:
+            return None
+        return _load_session(session_id, data)
+
+    async def get_by_id_with_user(self, session_id: UUID) -> tuple[Session, User] | None:
+        session = await self.get_by_id(session_id)
+        if session is None:
+            return None
+        user = await UserODM.find_one(UserODM.id == session.user_id)
+        if user is None:
+            return None
+        return session, user.to_entity()
+
+    async def update_last_used(self, session_id: UUID, last_used: datetime) -> None:
+        updated = await self._update_last_used_script(
+            keys=[_session_key(session_id)],
+            args=_update_last_used_args(session_id, last_used),
+        )
+        if not updated:
+            raise Exception("Session not found")
+
+    async def get_by_user_id(self, user_id: UUID, limit: int, after: SessionsCursor | None = None) -> list[Session]:
+        index_key = _user_sessions_by_last_used_key(user_id)
+        sessions: list[Session] = []
+        max_score: int | str = "+inf"
+        if after is not None:
+            score = _last_used_score(after.last_used)
+            ties = [_to_str(session_id) for session_id in await self.redis.zrangebyscore(index_key, score, score)]
+            session_ids = sorted((UUID(tie) for tie in ties if tie < str(after.id)), key=str, reverse=True)
+            sessions += await self._load_live_sessions(index_key, session_ids[:limit])
+            max_score = f"({score}"
+
+        offset = 0
+        while len(sessions) < limit:
+            session_ids = [
+                UUID(_to_str(session_id))
+                for session_id in await self.redis.zrevrangebyscore(  # pyright: ignore[reportGeneralTypeIssues]
+                    index_key, max_score, "-inf", start=offset, num=limit - len(sessions)
+                )
+            ]
+            if not session_ids:
+                break
+            live_sessions = await self._load_live_sessions(index_key, session_ids)
+            offset += len(live_sessions)
+            sessions += live_sessions
+        return sessions
+
+    async def _load_live_sessions(self, index_key: str, session_ids: list[UUID]) -> list[Session]:
+        if not session_ids:
+            return []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(_session_key(session_id))
+            results = await pipe.execute()
+
+        sessions = []
+        expired = []
+        for session_id, data in zip(session_ids, results, strict=True):
+            if data:
+                sessions.append(_load_session(session_id, data))
+            else:
+                expired.append(str(session_id))
+        if expired:
+            await self.redis.zrem(index_key, *expired)
+        return sessions
+
+    async def bulk_update_last_used(self, updates: dict[UUID, datetime]) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id, last_used in updates.items():
+                await self._update_last_used_script(
+                    keys=[_session_key(session_id)],
+                    args=_update_last_used_args(session_id, last_used),
+                    client=pipe,
+                )
+            await pipe.execute()
+
+    async def delete_session(self, session_id: UUID) -> None:
+        key = _session_key(session_id)
+        user_id = await self.redis.hget(key, "user_id")  # pyright: ignore[reportGeneralTypeIssues]
+        if user_id is None:
+            raise Exception("Session not found")
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.zrem(_user_sessions_key(_to_str(user_id)), str(session_id))
+            pipe.zrem(_user_sessions_by_last_used_key(_to_str(user_id)), str(session_id))
+            await pipe.execute()
+
+    async def delete_all_session_by_user_id(self, user_id: UUID) -> None:
+        index_key = _user_sessions_key(user_id)
+
+        async def delete_all(pipe: Pipeline) -> None:
+            session_ids = await pipe.zrange(index_key, 0, -1)
+            pipe.multi()
+            pipe.delete(
+                index_key,
+                _user_sessions_by_last_used_key(user_id),
+                *(_session_key(_to_str(session_id)) for session_id in session_ids),
+            )
+
+        await self.redis.transaction(delete_all, index_key)
+
+    async def delete_many(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        async for session_ids in self._iter_session_ids(filter, batch_size):
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.hgetall(_session_key(session_id))
+                results = await pipe.execute()
+
+            sessions = [
+                _load_session(session_id, data) for session_id, data in zip(session_ids, results, strict=True) if data
+            ]
+            sessions = [session for session in sessions if _matches(session, filter)]
+            if not sessions:
+                continue
+
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for session in sessions:
+                    pipe.delete(_session_key(session.id))
+                    pipe.zrem(_user_sessions_key(session.user_id), str(session.id))
+                    pipe.zrem(_user_sessions_by_last_used_key(session.user_id), str(session.id))
+                await pipe.execute()
+            yield [session.id for session in sessions]
+
+    async def _iter_session_ids(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        if filter.user_ids is not None:
+            for user_id in filter.user_ids:
+                session_ids = await self.redis.zrange(_user_sessions_key(user_id), 0, -1)
+                for i in range(0, len(session_ids), batch_size):
+                    yield [UUID(_to_str(session_id)) for session_id in session_ids[i : i + batch_size]]
+            return
+
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(cursor, match=_session_key("*"), count=batch_size)
+            if keys:
+                yield [UUID(_to_str(key).removeprefix(_session_key(""))) for key in keys]
+            if not cursor:
+                return
+
+
+def _update_last_used_args(session_id: UUID, last_used: datetime) -> list[str | int]:
+    return [_dump_datetime(last_used), _last_used_score(last_used), USER_SESSIONS_BY_LAST_USED_PREFIX, str(session_id)]
+
+
+def _matches(session: Session, filter: SessionsFilterDTO) -> bool:
+    if filter.user_ids is not None and session.user_id not in filter.user_ids:
+        return False
+    if filter.ip_address is not None and session.ip_address != filter.ip_address:
+        return False
+    if filter.expires_before is not None and session.expires_at >= filter.expires_before:
+        return False
+    return True
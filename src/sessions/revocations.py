@@ -0,0 +1,38 @@
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from src.config import settings
+from src.logger import logger
+
+
+def _revoked_session_key(session_id: UUID) -> str:
+    return f"revoked_session:{session_id}"
+
+
+@dataclass
+class SessionRevocations:
+    redis: Redis
+
+    async def revoke(self, session_ids: Iterable[UUID]) -> None:
+        if settings.SESSION_TOKEN_MODE != "stateless":
+            return
+
+        ttl = math.ceil(settings.SESSION_REVALIDATE_SECONDS)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.set(_revoked_session_key(session_id), 1, ex=ttl)
+                await pipe.execute()
+        except Exception:
+            logger.error("Failed to record session revocations: ", exc_info=True)
+
+    async def is_revoked(self, session_id: UUID) -> bool:
+        try:
+            return bool(await self.redis.exists(_revoked_session_key(session_id)))
+        except Exception:
+            logger.error("Failed to check session revocation: ", exc_info=True)
+            return True
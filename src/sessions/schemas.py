@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Self
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 @dataclass
@@ -15,3 +16,23 @@ class SessionSchema(BaseModel):
     last_used: datetime
     ip_address: str
     expires_at: datetime
+
+
+class SessionsPageSchema(BaseModel):
+    items: list[SessionSchema]
+    next_cursor: str | None
+
+
+class RevokeSessionsSchema(BaseModel):
+    user_ids: list[UUID] | None = None
+    ip_address: str | None = None
+    created_before: datetime | None = None
+    client_id: UUID | None = None
+
+    @model_validator(mode="after")
+    def check_filters(self) -> Self:
+        if self.user_ids is None and self.ip_address is None and self.created_before is None and self.client_id is None:
+            raise ValueError("At least one filter is required")
+        if self.ip_address is not None and self.client_id is not None:
+            raise ValueError("ip_address only applies to browser sessions and client_id only to OAuth2 sessions")
+        return self
@@ -1,24 +1,38 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from uuid import UUID
 
 from src.config import settings
-from src.sessions.dto import CreateSessionDTO
+from src.sessions.dto import CreateSessionDTO, SessionsCursor, SessionsFilterDTO, SessionsPageDTO
 from src.sessions.entities import Session, SessionFields
+from src.sessions.utils import decode_sessions_cursor, encode_sessions_cursor
+from src.users.entities import User
 
+from .buffer import LastUsedBuffer
 from .repository import ISessionsRepository
+from .revocations import SessionRevocations
 
 
 class ISessionsService(ABC):
     @abstractmethod
     async def get_by_id(self, session_id: UUID) -> Session | None: ...
 
+    @abstractmethod
+    async def get_by_id_with_user(self, session_id: UUID) -> tuple[Session, User] | None: ...
+
+    @abstractmethod
+    async def get_page_by_user_id(self, user_id: UUID, limit: int, cursor: str | None = None) -> SessionsPageDTO: ...
+
     @abstractmethod
     async def create_new_session(self, dto: CreateSessionDTO) -> Session: ...
 
     @abstractmethod
-    async def update_last_used(self, session_id: UUID) -> None: ...
+    async def update_last_used(self, session: Session) -> None: ...
+
+    @abstractmethod
+    async def is_revoked(self, session_id: UUID) -> bool: ...
 
     @abstractmethod
     async def delete(self, session_id: UUID) -> None: ...
@@ -26,10 +40,15 @@ class ISessionsService(ABC):
     @abstractmethod
     async def delete_all_by_user_id(self, user_id: UUID) -> None: ...
 
+    @abstractmethod
+    def revoke_many(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]: ...
+
 
 @dataclass(kw_only=True)
 class SessionsService(ISessionsService):
     repository: ISessionsRepository
+    last_used_buffer: LastUsedBuffer
+    revocations: SessionRevocations
 
     async def create_new_session(self, dto: CreateSessionDTO) -> Session:
         return await self.repository.add(
@@ -44,11 +63,35 @@ class SessionsService(ISessionsService):
     async def get_by_id(self, session_id: UUID) -> Session | None:
         return await self.repository.get_by_id(session_id)
 
-    async def update_last_used(self, session_id: UUID) -> None:
-        return await self.repository.update_last_used(session_id, datetime.now())
+    async def get_by_id_with_user(self, session_id: UUID) -> tuple[Session, User] | None:
+        return await self.repository.get_by_id_with_user(session_id)
+
+    async def get_page_by_user_id(self, user_id: UUID, limit: int, cursor: str | None = None) -> SessionsPageDTO:
+        after = decode_sessions_cursor(cursor) if cursor else None
+        sessions = await self.repository.get_by_user_id(user_id, limit + 1, after)
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = encode_sessions_cursor(SessionsCursor(last_used=sessions[-1].last_used, id=sessions[-1].id))
+        return SessionsPageDTO(items=sessions, next_cursor=next_cursor)
+
+    async def update_last_used(self, session: Session) -> None:
+        self.last_used_buffer.record(session, datetime.now())
+
+    async def is_revoked(self, session_id: UUID) -> bool:
+        return await self.revocations.is_revoked(session_id)
 
     async def delete(self, session_id: UUID) -> None:
+        self.last_used_buffer.discard(session_id)
+        await self.revocations.revoke([session_id])
         await self.repository.delete_session(session_id)
 
     async def delete_all_by_user_id(self, user_id: UUID) -> None:
         await self.repository.delete_all_session_by_user_id(user_id)
+
+    async def revoke_many(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        async for session_ids in self.repository.delete_many(filter, batch_size):
+            for session_id in session_ids:
+                self.last_used_buffer.discard(session_id)
+            await self.revocations.revoke(session_ids)
+            yield session_ids
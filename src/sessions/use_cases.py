@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from src.auth.cache import SessionTokensCache
+from src.config import settings
+from src.oauth2_sessions.dto import OAuth2SessionsFilterDTO
+from src.oauth2_sessions.service import IOAuthSessionsService
+from src.sessions.dto import RevocationProgressDTO, SessionsFilterDTO, SessionsPageDTO
+from src.sessions.service import ISessionsService
+from src.users.entities import User
+
+
+@dataclass
+class GetUserSessionsCommand:
+    user: User
+    limit: int
+    cursor: str | None = None
+
+
+@dataclass
+class GetUserSessionsUseCase:
+    sessions_service: ISessionsService
+
+    async def execute(self, command: GetUserSessionsCommand) -> SessionsPageDTO:
+        return await self.sessions_service.get_page_by_user_id(command.user.id, command.limit, command.cursor)
+
+
+@dataclass
+class GetSessionsByUserIdCommand:
+    admin: User
+    user_id: UUID
+    limit: int
+    cursor: str | None = None
+
+
+@dataclass
+class GetSessionsByUserIdUseCase:
+    sessions_service: ISessionsService
+
+    async def execute(self, command: GetSessionsByUserIdCommand) -> SessionsPageDTO:
+        return await self.sessions_service.get_page_by_user_id(command.user_id, command.limit, command.cursor)
+
+
+@dataclass
+class RevokeSessionsCommand:
+    admin: User
+    user_ids: list[UUID] | None = None
+    ip_address: str | None = None
+    created_before: datetime | None = None
+    client_id: UUID | None = None
+
+
+@dataclass
+class RevokeSessionsUseCase:
+    sessions_service: ISessionsService
+    oauth_sessions_service: IOAuthSessionsService
+    session_tokens_cache: SessionTokensCache
+
+    async def execute(self, command: RevokeSessionsCommand) -> AsyncIterator[RevocationProgressDTO]:
+        created_before = command.created_before
+        if created_before is not None and created_before.tzinfo is not None:
+            created_before = created_before.astimezone().replace(tzinfo=None)
+
+        progress = RevocationProgressDTO()
+        batch_size = settings.SESSIONS_REVOKE_BATCH_SIZE
+
+        if command.client_id is None:
+            sessions_filter = SessionsFilterDTO(
+                user_ids=command.user_ids,
+                ip_address=command.ip_address,
+                expires_before=(
+                    created_before + timedelta(hours=settings.SESSION_EXPIRE_HOURS) if created_before else None
+                ),
+            )
+            async for session_ids in self.sessions_service.revoke_many(sessions_filter, batch_size):
+                self.session_tokens_cache.invalidate(session_ids)
+                progress.sessions += len(session_ids)
+                yield progress
+                await asyncio.sleep(0)
+
+        if command.ip_address is None:
+            oauth2_sessions_filter = OAuth2SessionsFilterDTO(
+                user_ids=command.user_ids,
+                client_id=command.client_id,
+                created_before=created_before,
+            )
+            async for session_ids in self.oauth_sessions_service.revoke_many(oauth2_sessions_filter, batch_size):
+                progress.oauth2_sessions += len(session_ids)
+                yield progress
+                await asyncio.sleep(0)
+
+        progress.done = True
+        yield progress
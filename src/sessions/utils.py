@@ -1,8 +1,13 @@
+import base64
 from datetime import UTC, datetime, timedelta
+from uuid import UUID
 
+import orjson
 from fastapi import Response
 
 from src.config import settings
+from src.sessions.dto import SessionsCursor
+from src.sessions.exceptions import InvalidCursor
 
 
 def set_session_cookie(token: str, res: Response):
@@ -16,3 +21,17 @@ def set_session_cookie(token: str, res: Response):
 
 def delete_session_cookie(res: Response):
     res.delete_cookie(settings.SESSION_KEY)
+
+
+def encode_sessions_cursor(cursor: SessionsCursor) -> str:
+    data = orjson.dumps([cursor.last_used.isoformat(), str(cursor.id)])
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_sessions_cursor(cursor: str) -> SessionsCursor:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_used, session_id = orjson.loads(data)
+        return SessionsCursor(last_used=datetime.fromisoformat(last_used), id=UUID(session_id))
+    except Exception:
+        raise InvalidCursor
@@ -1,3 +1,70 @@
-from fastapi import APIRouter
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Annotated, Any
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from src.auth.dependencies import AdminAuthorization, UserAuthorization
+from src.config import settings
+from src.dependencies import Provide
+from src.sessions.use_cases import (
+    GetSessionsByUserIdCommand,
+    GetSessionsByUserIdUseCase,
+    GetUserSessionsCommand,
+    GetUserSessionsUseCase,
+    RevokeSessionsCommand,
+    RevokeSessionsUseCase,
+)
+
+from .schemas import RevokeSessionsSchema, SessionsPageSchema
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
+
+PageSize = Annotated[int, Query(ge=1, le=settings.SESSIONS_MAX_PAGE_SIZE)]
+
+
+@router.get("", response_model=SessionsPageSchema)
+async def get_sessions(
+    user: UserAuthorization,
+    limit: PageSize = settings.SESSIONS_PAGE_SIZE,
+    cursor: str | None = None,
+    use_case=Provide(GetUserSessionsUseCase),
+) -> Any:
+    return await use_case.execute(GetUserSessionsCommand(user=user, limit=limit, cursor=cursor))
+
+
+@router.get("/users/{user_id}", response_model=SessionsPageSchema)
+async def get_user_sessions(
+    admin: AdminAuthorization,
+    user_id: UUID,
+    limit: PageSize = settings.SESSIONS_PAGE_SIZE,
+    cursor: str | None = None,
+    use_case=Provide(GetSessionsByUserIdUseCase),
+) -> Any:
+    return await use_case.execute(GetSessionsByUserIdCommand(admin=admin, user_id=user_id, limit=limit, cursor=cursor))
+
+
+@router.post("/revoke", response_class=StreamingResponse)
+async def revoke_sessions(
+    admin: AdminAuthorization,
+    data: RevokeSessionsSchema,
+    use_case=Provide(RevokeSessionsUseCase),
+) -> Any:
+    progress = use_case.execute(
+        RevokeSessionsCommand(
+            admin=admin,
+            user_ids=data.user_ids,
+            ip_address=data.ip_address,
+            created_before=data.created_before,
+            client_id=data.client_id,
+        )
+    )
+
+    async def stream() -> AsyncIterator[bytes]:
+        async for item in progress:
+            yield orjson.dumps(asdict(item)) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
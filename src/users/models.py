@@ -11,7 +11,7 @@ from src.users.entities import User, UserFields
 class UserODM(Document):
     id: UUID = Field(default_factory=uuid4)  # type: ignore
     username: Annotated[str, Indexed(unique=True)]
-    email: str
+    email: Annotated[str, Indexed()]
     email_verified: bool
     hashed_password: bytes
     image_url: str | None = Field(default=None)
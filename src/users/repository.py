@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 
+from beanie import UpdateResponse
+from beanie.operators import Set
+
 from src.users.models import UserODM
 
 from .entities import User, UserFields
@@ -55,28 +58,28 @@ class MongoUsersRepository(IUsersRepository):
         return user.to_entity() if user else None
 
     async def update_username(self, id: UUID, new_username: str) -> User:
-        user = await UserODM.find_one(UserODM.id == id)
+        user = await UserODM.find_one(UserODM.id == id).update(  # pyright: ignore[reportGeneralTypeIssues]
+            Set({UserODM.username: new_username}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
         if user is None:
             raise Exception("User not found")
-
-        user.username = new_username
-        await user.save()
         return user.to_entity()
 
     async def update_password(self, id: UUID, new_password_hash: bytes) -> User:
-        user = await UserODM.find_one(UserODM.id == id)
+        user = await UserODM.find_one(UserODM.id == id).update(  # pyright: ignore[reportGeneralTypeIssues]
+            Set({UserODM.hashed_password: new_password_hash}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
         if user is None:
             raise Exception("User not found")
-
-        user.hashed_password = new_password_hash
-        await user.save()
         return user.to_entity()
 
     async def change_active_status(self, id: UUID, new_status: bool) -> User:
-        user = await UserODM.find_one(UserODM.id == id)
+        user = await UserODM.find_one(UserODM.id == id).update(  # pyright: ignore[reportGeneralTypeIssues]
+            Set({UserODM.active: new_status}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
         if user is None:
             raise Exception("User not found")
-
-        user.active = new_status
-        await user.save()
         return user.to_entity()
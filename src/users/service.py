@@ -43,7 +43,7 @@ class UsersService(IUsersService):
                 username=dto.username,
                 email=dto.email,
                 email_verified=False,
-                hashed_password=self.hash_service.create(dto.password),
+                hashed_password=await self.hash_service.create(dto.password),
                 image_url=None,
                 active=True,
                 created_at=datetime.now(),
@@ -71,7 +71,7 @@ class UsersService(IUsersService):
     async def update_password(self, dto: UpdateUserPasswordDTO) -> None:
         await self.repository.update_password(
             id=dto.user_id,
-            new_password_hash=self.hash_service.create(dto.new_password),
+            new_password_hash=await self.hash_service.create(dto.new_password),
         )
 
     async def deactivate_user(self, id: UUID) -> None:
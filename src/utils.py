@@ -11,10 +11,10 @@ from src.logger import logger
 from src.schemas import AppScopes, AuthoritativeApp, KeyPair
 
 
-def load_certs() -> list[str]:
+def load_certs(cert_dir: str = settings.CERT_DIR) -> list[str]:
     certs = []
     try:
-        for cert_path in glob.glob(os.path.join(settings.CERT_DIR, "*.pem")):
+        for cert_path in glob.glob(os.path.join(cert_dir, "*.pem")):
             with open(cert_path) as f:
                 certs.append(f.read())
 
@@ -37,12 +37,15 @@ def create_jwk_keys_from_certs(certs: list[str]) -> list[tuple[jwk.JWK, jwk.JWK]
     return jwk_keys
 
 
-def load_certs_and_create_key_pairs() -> list[KeyPair]:
-    certs = load_certs()
+def create_key_pairs(certs: list[str]) -> list[KeyPair]:
     jwk_keys = create_jwk_keys_from_certs(certs)
     return [KeyPair(private_key=private_key, public_key=public_key) for private_key, public_key in jwk_keys]
 
 
+def load_certs_and_create_key_pairs() -> list[KeyPair]:
+    return create_key_pairs(load_certs())
+
+
 def load_authoritative_apps() -> tuple[dict[UUID, AuthoritativeApp], AppScopes]:
     try:
         with open(settings.AUTHORITATIVE_APPS_PATH) as f:
@@ -6,6 +6,7 @@ class OpenIdConfigurationSchema(BaseModel):
     token_endpoint: str
     issuer: str
     jwks_uri: str
+    scopes_supported: list[str]
     response_types_supported: list[str]
     grant_types_supported: list[str]
     id_token_signing_alg_values_supported: list[str]
@@ -16,9 +17,18 @@ class JWKSchema(BaseModel):
     alg: str
     use: str
     kid: str
-    n: str
-    e: str
+    n: str | None = None
+    e: str | None = None
+    crv: str | None = None
+    x: str | None = None
+    y: str | None = None
 
 
 class JWKSetSchema(BaseModel):
     keys: list[JWKSchema]
+
+
+class ScopeRegistrySchema(BaseModel):
+    claim: str
+    encoding: str
+    scopes: list[str]
@@ -1,40 +1,73 @@
+import hashlib
+from dataclasses import dataclass
 from typing import Any
 
+import orjson
+from jwcrypto.common import json_decode
+
 from src.config import settings
 from src.oauth2.entities import GrantType, ResponseType
 from src.services.key_manager import KeyManager
+from src.services.scope_registry import ScopeRegistry
+
+
+@dataclass(frozen=True, slots=True)
+class CachedDocument:
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> "CachedDocument":
+        content = orjson.dumps(data)
+        return cls(content=content, etag=f'"{hashlib.sha256(content).hexdigest()}"')
 
 
 class WellKnownService:
-    def __init__(self, key_manager: KeyManager) -> None:
+    def __init__(self, key_manager: KeyManager, scope_registry: ScopeRegistry) -> None:
         self.key_manager = key_manager
+        self.scope_registry = scope_registry
+        self.scopes_document = CachedDocument.from_data(self.load_scopes())
+        self.refresh()
+        self.key_manager.subscribe(self.refresh)
+
+    def refresh(self) -> None:
         self.jwks = self.load_jwks()
+        self.jwks_document = CachedDocument.from_data(self.jwks)
+        self.openid_configuration_document = CachedDocument.from_data(self.load_openid_configuration())
 
     def load_jwks(self) -> dict[str, Any]:
         keys = []
-        for kid, key in self.key_manager.public_keys_by_kid.items():
+        for key in self.key_manager.keys:
             keys.append(
                 {
-                    "kty": key.get("kty"),
-                    "alg": settings.ALGORITHM,
+                    **json_decode(key.key_pair.public_key.export_public()),
+                    "alg": key.algorithm,
                     "use": "sig",
-                    "kid": kid,
-                    "n": key.get("n"),
-                    "e": key.get("e"),
+                    "kid": key.kid,
                 }
             )
         return {"keys": keys}
 
-    def get_jwks(self) -> dict[str, Any]:
-        return self.jwks
-
-    def get_openid_configuration(self) -> dict[str, Any]:
+    def load_openid_configuration(self) -> dict[str, Any]:
         return {
             "authorization_endpoint": f"{settings.DOMAIN_URL}/oauth/authorize",
             "token_endpoint": f"{settings.DOMAIN_URL}/oauth/token",
             "issuer": settings.DOMAIN_URL,
             "jwks_uri": f"{settings.DOMAIN_URL}/.well-known/jwks.json",
+            "scopes_supported": self.scope_registry.names,
             "response_types_supported": list(ResponseType),
             "grant_types_supported": list(GrantType),
-            "id_token_signing_alg_values_supported": ["RS256"],
+            "id_token_signing_alg_values_supported": self.key_manager.algorithms,
         }
+
+    def load_scopes(self) -> dict[str, Any]:
+        return {"claim": "scp", "encoding": "base64url", "scopes": self.scope_registry.names}
+
+    def get_jwks(self) -> CachedDocument:
+        return self.jwks_document
+
+    def get_openid_configuration(self) -> CachedDocument:
+        return self.openid_configuration_document
+
+    def get_scopes(self) -> CachedDocument:
+        return self.scopes_document
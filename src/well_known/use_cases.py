@@ -1,14 +1,13 @@
 from dataclasses import dataclass
-from typing import Any
 
-from .service import WellKnownService
+from .service import CachedDocument, WellKnownService
 
 
 @dataclass
 class GetOpenIdConfigurationUseCase:
     well_known_service: WellKnownService
 
-    def execute(self) -> dict[str, Any]:
+    def execute(self) -> CachedDocument:
         return self.well_known_service.get_openid_configuration()
 
 
@@ -16,5 +15,13 @@ class GetOpenIdConfigurationUseCase:
 class GetJWKsUseCase:
     well_known_service: WellKnownService
 
-    def execute(self) -> dict[str, Any]:
+    def execute(self) -> CachedDocument:
         return self.well_known_service.get_jwks()
+
+
+@dataclass
+class GetScopeRegistryUseCase:
+    well_known_service: WellKnownService
+
+    def execute(self) -> CachedDocument:
+        return self.well_known_service.get_scopes()
@@ -1,24 +1,48 @@
-from typing import Any
-
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 
+from src.config import settings
 from src.dependencies import Provide
 
-from .schemas import JWKSetSchema, OpenIdConfigurationSchema
-from .use_cases import GetJWKsUseCase, GetOpenIdConfigurationUseCase
+from .schemas import JWKSetSchema, OpenIdConfigurationSchema, ScopeRegistrySchema
+from .service import CachedDocument
+from .use_cases import GetJWKsUseCase, GetOpenIdConfigurationUseCase, GetScopeRegistryUseCase
 
 router = APIRouter(prefix="/.well-known", tags=["well-known"])
 
 
-@router.get("/openid-configuration", response_model=OpenIdConfigurationSchema)
-def openid_configuration(
+def document_response(req: Request, document: CachedDocument) -> Response:
+    headers = {
+        "ETag": document.etag,
+        "Cache-Control": f"public, max-age={settings.WELL_KNOWN_MAX_AGE_SECONDS}",
+    }
+    if_none_match = req.headers.get("if-none-match")
+    if if_none_match:
+        etags = {etag.strip().removeprefix("W/") for etag in if_none_match.split(",")}
+        if document.etag in etags or "*" in etags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=document.content, media_type="application/json", headers=headers)
+
+
+@router.get("/openid-configuration", responses={status.HTTP_200_OK: {"model": OpenIdConfigurationSchema}})
+async def openid_configuration(
+    req: Request,
     use_case=Provide(GetOpenIdConfigurationUseCase),
-) -> Any:
-    return use_case.execute()
+) -> Response:
+    return document_response(req, use_case.execute())
 
 
-@router.get("/jwks.json", response_model=JWKSetSchema)
-def jwks_endpoint(
+@router.get("/jwks.json", responses={status.HTTP_200_OK: {"model": JWKSetSchema}})
+async def jwks_endpoint(
+    req: Request,
     use_case=Provide(GetJWKsUseCase),
-) -> Any:
-    return use_case.execute()
+) -> Response:
+    return document_response(req, use_case.execute())
+
+
+@router.get("/scopes.json", responses={status.HTTP_200_OK: {"model": ScopeRegistrySchema}})
+async def scopes_endpoint(
+    req: Request,
+    use_case=Provide(GetScopeRegistryUseCase),
+) -> Response:
+    return document_response(req, use_case.execute())
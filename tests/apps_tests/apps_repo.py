@@ -15,6 +15,9 @@ class InMemoryAppsRepository(IAppsRepository):
     async def get_by_client_id(self, client_id: UUID) -> Application | None:
         return next((app for app in self.apps.values() if app.client_id == client_id), None)
 
+    async def get_apps_by_user_id(self, user_id: UUID) -> list[Application]:
+        return [app for app in self.apps.values() if app.creator_id == user_id]
+
     async def add(self, app: Application) -> Application:
         if app.id is None:
             app.id = uuid4()
@@ -0,0 +1,72 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from src.apps.cache import AppsCache, AppsCacheInvalidator, UnknownClientIdsCache
+from src.apps.entities import Application
+from src.apps.service import AppsService
+from src.schemas import AppScopes
+from src.services.authoritative_apps import AuthoritativeAppsService
+from src.services.scope_registry import ScopeRegistry
+from tests.apps_tests.apps_repo import InMemoryAppsRepository
+from tests.fake_redis import FakeRedis
+
+CHANNEL = "apps"
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def repository() -> InMemoryAppsRepository:
+    return InMemoryAppsRepository()
+
+
+@pytest.fixture
+def apps_service(repository: InMemoryAppsRepository, redis: FakeRedis) -> AppsService:
+    apps_cache = AppsCache(maxsize=100, ttl=60)
+    return AppsService(
+        repository=repository,
+        authoritative_apps=AuthoritativeAppsService(apps={}),
+        unknown_client_ids=UnknownClientIdsCache(maxsize=100, ttl=60),
+        apps_cache=apps_cache,
+        apps_cache_invalidator=AppsCacheInvalidator(cache=apps_cache, redis=redis, channel=CHANNEL),  # type: ignore
+        scope_registry=ScopeRegistry(AppScopes.model_validate([{"name": "read"}])),
+    )
+
+
+@pytest.fixture
+async def app(repository: InMemoryAppsRepository) -> Application:
+    return await repository.add(
+        Application(
+            id=uuid4(),
+            name="app",
+            client_id=uuid4(),
+            client_secret=uuid4(),
+            redirect_uris=["http://localhost:3000/callback"],
+            scopes=["read"],
+            creator_id=uuid4(),
+            created_at=datetime.now(),
+            is_web_message_allowed=False,
+        )
+    )
+
+
+async def test_delete_evicts_cached_app(apps_service: AppsService, app: Application, redis: FakeRedis):
+    assert await apps_service.get_by_client_id(app.client_id) is not None
+    assert apps_service.apps_cache.get(app.client_id) is not None
+
+    await apps_service.delete(app.id)
+
+    assert apps_service.apps_cache.get(app.client_id) is None
+    assert redis.published == [(CHANNEL, str(app.client_id))]
+    assert await apps_service.get_by_client_id(app.client_id) is None
+
+
+async def test_delete_unknown_app_does_not_publish(apps_service: AppsService, redis: FakeRedis):
+    await apps_service.delete(uuid4())
+
+    assert redis.published == []
@@ -1,12 +1,55 @@
+import asyncio
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def set(self, key, value, **args):
+        self.commands.append(self.redis.set(key, value, **args))
+
+    async def execute(self):
+        return [await command for command in self.commands]
+
+
 class FakeRedis:
     def __init__(self):
         self.data = {}
+        self.published = []
 
-    async def set(self, key, value, **args):
+    async def set(self, key, value, nx=False, **args):
+        await asyncio.sleep(0)
+        if nx and key in self.data:
+            return None
         self.data[key] = value
+        return True
 
     async def get(self, key):
+        await asyncio.sleep(0)
         return self.data.get(key)
 
+    async def getdel(self, key):
+        await asyncio.sleep(0)
+        return self.data.pop(key, None)
+
+    async def exists(self, *keys):
+        await asyncio.sleep(0)
+        return sum(key in self.data for key in keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
     async def delete(self, key):
+        await asyncio.sleep(0)
         del self.data[key]
+
+    async def publish(self, channel, message):
+        await asyncio.sleep(0)
+        self.published.append((channel, message))
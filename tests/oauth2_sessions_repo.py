@@ -1,8 +1,10 @@
+import asyncio
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import Any
 from uuid import UUID, uuid4
 
-from src.oauth2_sessions.entities import OAuth2Session
+from src.oauth2_sessions.dto import OAuth2SessionsFilterDTO
+from src.oauth2_sessions.entities import OAuth2Session, OAuth2SessionFields
 from src.oauth2_sessions.repository import IOAuth2SessionsRepository
 
 
@@ -10,26 +12,50 @@ class InMemoryOAuth2SessionsRepository(IOAuth2SessionsRepository):
     def __init__(self):
         self.sessions: dict[UUID, OAuth2Session] = {}
 
-    async def add(self, session: OAuth2Session) -> OAuth2Session:
-        if session.id is None:
-            session.id = uuid4()
-        self.sessions[session.id] = session
-        return session
+    async def add(self, session: OAuth2SessionFields) -> OAuth2Session:
+        new_session = OAuth2Session(id=uuid4(), **session.__dict__)
+        self.sessions[new_session.id] = new_session
+        return new_session
 
     async def get_by_id(self, session_id: UUID) -> OAuth2Session | None:
         return self.sessions.get(session_id)
 
-    async def get_by_token_id(self, jti: UUID) -> dict[str, Any] | None:
-        session = next((s for s in self.sessions.values() if s.id == jti), None)
-        return session.__dict__ if session else None
-
-    async def update_token_id_and_last_refresh(self, session_id: UUID, token_id: UUID, last_refresh: datetime) -> None:
-        session = self.sessions[session_id]
-        session.id = token_id
-        session.last_refresh = last_refresh
+    async def get_by_token_id(self, token_id: UUID) -> OAuth2Session | None:
+        return next((s for s in self.sessions.values() if s.token_id == token_id), None)
+
+    async def rotate_token_id(
+        self, token_id: UUID, new_token_id: UUID, last_refresh: datetime, expires_at: datetime, reuse_since: datetime
+    ) -> OAuth2Session | None:
+        await asyncio.sleep(0)
+        for session in self.sessions.values():
+            if session.expires_at <= last_refresh:
+                continue
+            if session.token_id == token_id:
+                session.previous_token_id = token_id
+                session.token_id = new_token_id
+                session.last_refresh = last_refresh
+                session.expires_at = expires_at
+                return session
+            if session.previous_token_id == token_id and session.last_refresh >= reuse_since:
+                return session
+        return None
 
     async def delete_session(self, session_id: UUID) -> OAuth2Session | None:
         return self.sessions.pop(session_id, None)
 
     async def delete_sessions(self, user_id: UUID) -> None:
         self.sessions = {k: v for k, v in self.sessions.items() if v.user_id != user_id}
+
+    async def delete_many(self, filter: OAuth2SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        session_ids = [
+            s.id
+            for s in self.sessions.values()
+            if (filter.user_ids is None or s.user_id in filter.user_ids)
+            and (filter.client_id is None or s.client_id == filter.client_id)
+            and (filter.created_before is None or s.created_at < filter.created_before)
+        ]
+        for i in range(0, len(session_ids), batch_size):
+            batch = session_ids[i : i + batch_size]
+            for session_id in batch:
+                del self.sessions[session_id]
+            yield batch
@@ -0,0 +1,51 @@
+import asyncio
+from uuid import uuid4
+
+from fakeredis.aioredis import FakeRedis as LuaFakeRedis
+from redis.exceptions import ResponseError
+
+from src.oauth2.entities import AuthorizationRequest
+from src.oauth2.exceptions import InvalidAuthorizationCode
+from src.services.oauth_auth_requests import AuthorizationRequestsRepository, AuthReqService
+from tests.fake_redis import FakeRedis
+
+
+class NoGetDelRedis(LuaFakeRedis):
+    async def getdel(self, name):
+        raise ResponseError("unknown command 'GETDEL', with args beginning with: ")
+
+
+def make_request() -> AuthorizationRequest:
+    return AuthorizationRequest(
+        user_id=uuid4(),
+        client_id=uuid4(),
+        requested_scopes=["read"],
+        redirect_uri="http://localhost:3000/callback",
+    )
+
+
+async def test_authorization_code_is_redeemed_once():
+    service = AuthReqService(repository=AuthorizationRequestsRepository(redis=FakeRedis()))
+    code = await service.create_new_request(make_request())
+
+    results = await asyncio.gather(*(service.get(code) for _ in range(20)), return_exceptions=True)
+
+    redeemed = [result for result in results if isinstance(result, AuthorizationRequest)]
+    rejected = [result for result in results if isinstance(result, InvalidAuthorizationCode)]
+    assert len(redeemed) == 1
+    assert len(rejected) == 19
+
+
+async def test_authorization_code_is_redeemed_once_without_getdel():
+    repository = AuthorizationRequestsRepository(redis=NoGetDelRedis())
+    service = AuthReqService(repository=repository)
+    code = await service.create_new_request(make_request())
+
+    results = await asyncio.gather(*(service.get(code) for _ in range(20)), return_exceptions=True)
+
+    redeemed = [result for result in results if isinstance(result, AuthorizationRequest)]
+    rejected = [result for result in results if isinstance(result, InvalidAuthorizationCode)]
+    assert len(redeemed) == 1
+    assert len(rejected) == 19
+    assert repository.getdel_supported is False
+    assert not await repository.redis.exists(code)
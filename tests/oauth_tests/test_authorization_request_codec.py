@@ -0,0 +1,88 @@
+from uuid import uuid4
+
+import pytest
+
+from src.oauth2.entities import AuthorizationRequest, CodeChallengeMethod
+from src.oauth2.exceptions import InvalidAuthorizationCode, InvalidAuthorizationRequest
+from src.services.oauth_auth_requests import (
+    AUTHORIZATION_REQUEST_VERSION,
+    MAX_FIELD_LENGTH,
+    AuthorizationRequestsRepository,
+    AuthReqService,
+    dump_authorization_request,
+    load_authorization_request,
+)
+from tests.fake_redis import FakeRedis
+
+
+def make_request(**kwargs) -> AuthorizationRequest:
+    return AuthorizationRequest(
+        user_id=uuid4(),
+        client_id=uuid4(),
+        requested_scopes=kwargs.pop("requested_scopes", ["read", "write"]),
+        redirect_uri="http://localhost:3000/callback",
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "req",
+    [
+        make_request(),
+        make_request(requested_scopes=[]),
+        make_request(state="", code_challenge="challenge", code_challenge_method=CodeChallengeMethod.s256),
+        make_request(state="ünïcode state"),
+    ],
+)
+def test_round_trip(req: AuthorizationRequest):
+    assert load_authorization_request(dump_authorization_request(req)) == req
+
+
+def test_longest_state_round_trips():
+    req = make_request(state="s" * MAX_FIELD_LENGTH)
+
+    assert load_authorization_request(dump_authorization_request(req)) == req
+
+
+@pytest.mark.parametrize(
+    "req",
+    [
+        make_request(state="s" * (MAX_FIELD_LENGTH + 1)),
+        make_request(state="ü" * (MAX_FIELD_LENGTH // 2 + 1)),
+        make_request(code_challenge="c" * (MAX_FIELD_LENGTH + 1), code_challenge_method=CodeChallengeMethod.s256),
+        make_request(requested_scopes=["s" * MAX_FIELD_LENGTH, "s"]),
+    ],
+)
+def test_oversized_field_is_rejected(req: AuthorizationRequest):
+    with pytest.raises(InvalidAuthorizationRequest):
+        dump_authorization_request(req)
+
+
+def test_truncated_record_is_rejected():
+    data = dump_authorization_request(make_request(state="state"))
+
+    for length in range(len(data)):
+        assert load_authorization_request(data[:length]) is None
+
+
+def test_unknown_version_is_rejected():
+    data = dump_authorization_request(make_request())
+
+    assert load_authorization_request(bytes([AUTHORIZATION_REQUEST_VERSION + 1]) + data[1:]) is None
+
+
+def test_trailing_bytes_are_rejected():
+    assert load_authorization_request(dump_authorization_request(make_request()) + b"\x00") is None
+
+
+def test_str_record_is_rejected():
+    assert load_authorization_request(dump_authorization_request(make_request()).decode("latin-1")) is None
+
+
+async def test_unparsable_record_is_invalid_code():
+    redis = FakeRedis()
+    service = AuthReqService(repository=AuthorizationRequestsRepository(redis=redis))  # type: ignore
+    redis.data["code"] = "not a record"
+
+    with pytest.raises(InvalidAuthorizationCode):
+        await service.get("code")
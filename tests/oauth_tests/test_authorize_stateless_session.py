@@ -0,0 +1,231 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import bcrypt
+import jwcrypto.jwk
+import pytest
+
+from src.apps.cache import AppsCache, AppsCacheInvalidator, UnknownClientIdsCache
+from src.apps.service import AppsService
+from src.auth.cache import InvalidSessionTokensCache, SessionTokensCache
+from src.auth.exceptions import InvalidSession
+from src.auth.service import AuthService
+from src.auth.tokens import SessionTokenCodec
+from src.auth.use_cases import LoginCommand, LoginUseCase
+from src.config import settings
+from src.oauth2.entities import ResponseType
+from src.oauth2.responses import RedirectUriError, RedirectUriSuccess
+from src.oauth2.service import OAuthService
+from src.oauth2.use_cases import OAuthAuthorizeCommand, OAuthAuthorizeUseCase
+from src.oauth2_sessions.service import OAuthSessionsService
+from src.schemas import AppScopes, KeyPair
+from src.services.hash import ImplHash
+from src.services.jwe import ImplJWE
+from src.services.jwt import ImplJWT
+from src.services.key_manager import KeyManager
+from src.services.oauth_auth_requests import MAX_FIELD_LENGTH, AuthorizationRequestsRepository, AuthReqService
+from src.services.scope_registry import ScopeRegistry
+from src.sessions.buffer import LastUsedBuffer
+from src.sessions.dto import SessionsFilterDTO
+from src.sessions.revocations import SessionRevocations
+from src.sessions.service import SessionsService
+from src.users.entities import User
+from src.users.service import UsersService
+from tests.fake_redis import FakeRedis
+from tests.oauth2_sessions_repo import InMemoryOAuth2SessionsRepository
+from tests.sessions_repo import InMemorySessionsRepository
+from tests.users_repo import InMemoryUsersRepository
+
+PASSWORD = "INrf3fs@"
+REDIRECT_URI = "http://localhost:3000/callback"
+
+PRIVATE_KEY = jwcrypto.jwk.JWK.generate(kty="RSA", size=2048)
+PUBLIC_KEY = jwcrypto.jwk.JWK.from_pem(PRIVATE_KEY.export_to_pem())
+
+
+@pytest.fixture
+def stateless_sessions(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_TOKEN_MODE", "stateless")
+
+
+@pytest.fixture
+def key_manager() -> KeyManager:
+    return KeyManager(key_pairs=[KeyPair(private_key=PRIVATE_KEY, public_key=PUBLIC_KEY)])
+
+
+@pytest.fixture
+def users_repository() -> InMemoryUsersRepository:
+    repository = InMemoryUsersRepository()
+    user = User(
+        id=uuid4(),
+        username="johndoe",
+        email="johndoe@example.com",
+        email_verified=True,
+        hashed_password=bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)),
+        active=True,
+        created_at=datetime.now(),
+    )
+    repository.users[user.id] = user
+    return repository
+
+
+@pytest.fixture
+def auth_service(key_manager, users_repository) -> AuthService:
+    hash_service = ImplHash(executor=ThreadPoolExecutor(max_workers=1))
+    sessions_repository = InMemorySessionsRepository(users=users_repository.users)
+    return AuthService(
+        sessions_service=SessionsService(
+            repository=sessions_repository,
+            last_used_buffer=LastUsedBuffer(repository=sessions_repository, flush_interval=60, max_batch_size=1000),
+            revocations=SessionRevocations(redis=FakeRedis()),  # type: ignore
+        ),
+        hash_service=hash_service,
+        jwe=ImplJWE(key_manager=key_manager),
+        session_tokens_cache=SessionTokensCache(maxsize=100, ttl=60),
+        session_token_codec=SessionTokenCodec(key_manager=key_manager, revalidate_after=60),
+        invalid_session_tokens=InvalidSessionTokensCache(maxsize=100, ttl=60),
+    )
+
+
+@pytest.fixture
+def authorize_use_case(key_manager, auth_service, authoritative_apps_service) -> OAuthAuthorizeUseCase:
+    scope_registry = ScopeRegistry(AppScopes.model_validate([{"name": "read"}, {"name": "write"}]))
+    apps_cache = AppsCache(maxsize=100, ttl=60)
+    return OAuthAuthorizeUseCase(
+        oauth_service=OAuthService(
+            sessions_service=OAuthSessionsService(repository=InMemoryOAuth2SessionsRepository()),
+            jwt=ImplJWT(key_manager=key_manager, issuer="http://test", audience="http://test"),
+            jwe=ImplJWE(key_manager=key_manager),
+            scope_registry=scope_registry,
+        ),
+        auth_service=auth_service,
+        apps_service=AppsService(
+            repository=None,  # type: ignore
+            authoritative_apps=authoritative_apps_service,
+            unknown_client_ids=UnknownClientIdsCache(maxsize=100, ttl=60),
+            apps_cache=apps_cache,
+            apps_cache_invalidator=AppsCacheInvalidator(cache=apps_cache, redis=FakeRedis(), channel="apps"),  # type: ignore
+            scope_registry=scope_registry,
+        ),
+        requests_service=AuthReqService(repository=AuthorizationRequestsRepository(redis=FakeRedis())),  # type: ignore
+    )
+
+
+def authorize_command(session_token: str, client_id: UUID) -> OAuthAuthorizeCommand:
+    return OAuthAuthorizeCommand(
+        session_token=session_token,
+        response_type=ResponseType.code,
+        client_id=client_id,
+        redirect_uri=REDIRECT_URI,
+        scope=["read"],
+        state="state",
+        code_challenge=None,
+        code_challenge_method=None,
+    )
+
+
+async def login(auth_service: AuthService, users_repository: InMemoryUsersRepository) -> str:
+    use_case = LoginUseCase(
+        users_service=UsersService(repository=users_repository, hash_service=auth_service.hash_service),
+        sessions_service=auth_service.sessions_service,
+        auth_service=auth_service,
+        hash_service=auth_service.hash_service,
+    )
+    return await use_case.execute(LoginCommand(login="johndoe", password=PASSWORD, ip_address="127.0.0.1"))
+
+
+async def test_authorize_accepts_stateless_session_token(
+    stateless_sessions, auth_service, users_repository, authorize_use_case, authoritative_apps_service
+):
+    session_token = await login(auth_service, users_repository)
+    assert auth_service.session_token_codec.decode(session_token) is not None
+
+    result = await authorize_use_case.execute(
+        authorize_command(session_token, next(iter(authoritative_apps_service.apps)))
+    )
+
+    assert isinstance(result, RedirectUriSuccess)
+    assert result.code
+    assert authorize_use_case.session_token is None
+
+
+async def test_authorize_rejects_oversized_state(
+    stateless_sessions, auth_service, users_repository, authorize_use_case, authoritative_apps_service
+):
+    session_token = await login(auth_service, users_repository)
+    command = authorize_command(session_token, next(iter(authoritative_apps_service.apps)))
+    command.state = "s" * (MAX_FIELD_LENGTH + 1)
+
+    result = await authorize_use_case.execute(command)
+
+    assert isinstance(result, RedirectUriError)
+    assert result.error == "invalid_request"
+
+
+async def test_authorize_returns_reissued_session_token(
+    stateless_sessions, auth_service, users_repository, authorize_use_case, authoritative_apps_service
+):
+    auth_service.session_token_codec.revalidate_after = 0
+    session_token = await login(auth_service, users_repository)
+
+    result = await authorize_use_case.execute(
+        authorize_command(session_token, next(iter(authoritative_apps_service.apps)))
+    )
+
+    assert isinstance(result, RedirectUriSuccess)
+    assert authorize_use_case.session_token is not None
+    assert authorize_use_case.session_token != session_token
+    assert auth_service.session_token_codec.decode(authorize_use_case.session_token) is not None
+
+
+async def test_deleted_session_rejects_stateless_token_before_revalidation(
+    stateless_sessions, auth_service, users_repository
+):
+    session_token = await login(auth_service, users_repository)
+    snapshot = auth_service.session_token_codec.decode(session_token)
+    assert snapshot is not None
+    assert time.time() < snapshot.revalidate_at
+
+    await auth_service.sessions_service.delete(snapshot.session.id)
+
+    with pytest.raises(InvalidSession):
+        await auth_service.authenticate(session_token)
+
+
+async def test_revoked_sessions_reject_stateless_tokens_before_revalidation(
+    stateless_sessions, auth_service, users_repository
+):
+    session_token = await login(auth_service, users_repository)
+    snapshot = auth_service.session_token_codec.decode(session_token)
+    assert snapshot is not None
+
+    revoked = [
+        session_ids
+        async for session_ids in auth_service.sessions_service.revoke_many(
+            SessionsFilterDTO(user_ids=[snapshot.user.id]), batch_size=10
+        )
+    ]
+
+    assert revoked == [[snapshot.session.id]]
+    with pytest.raises(InvalidSession):
+        await auth_service.authenticate(session_token)
+
+
+async def test_authorize_rejects_garbage_session_token(
+    stateless_sessions, auth_service, authorize_use_case, authoritative_apps_service
+):
+    command = authorize_command("garbage", next(iter(authoritative_apps_service.apps)))
+    result = await authorize_use_case.execute(command)
+
+    assert isinstance(result, RedirectUriError)
+    assert result.error == "login_required"
+    assert "garbage" in auth_service.invalid_session_tokens
+
+    auth_service.session_token_codec = None  # type: ignore
+    auth_service.jwe = None  # type: ignore
+    result = await authorize_use_case.execute(command)
+
+    assert isinstance(result, RedirectUriError)
+    assert result.error == "login_required"
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from src.oauth2.config import settings
+from src.oauth2_sessions.entities import OAuth2Session, OAuth2SessionFields
+from src.oauth2_sessions.models import OAuth2SessionODM
+from src.oauth2_sessions.repository import MongoOAuth2SessionsRepository
+
+REUSE_WINDOW = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_WINDOW_SECONDS)
+EXPIRE = timedelta(hours=settings.REFRESH_TOKEN_EXPIRE_HOURS)
+
+
+@pytest.fixture
+async def repository() -> MongoOAuth2SessionsRepository:
+    await init_beanie(database=AsyncMongoMockClient()["auth_service"], document_models=[OAuth2SessionODM])
+    return MongoOAuth2SessionsRepository()
+
+
+async def add_session(repository: MongoOAuth2SessionsRepository, **fields) -> OAuth2Session:
+    now = datetime.now().replace(microsecond=0)
+    defaults = {
+        "user_id": uuid4(),
+        "client_id": uuid4(),
+        "token_id": uuid4(),
+        "scopes": ["read"],
+        "last_refresh": now,
+        "created_at": now,
+        "expires_at": now + EXPIRE,
+    }
+    return await repository.add(OAuth2SessionFields(**(defaults | fields)))
+
+
+async def rotate(repository: MongoOAuth2SessionsRepository, token_id, now: datetime) -> OAuth2Session | None:
+    return await repository.rotate_token_id(
+        token_id,
+        uuid4(),
+        last_refresh=now,
+        expires_at=now + EXPIRE,
+        reuse_since=now - REUSE_WINDOW,
+    )
+
+
+async def test_rotate_replaces_token_id(repository):
+    session = await add_session(repository)
+    now = datetime.now().replace(microsecond=0)
+
+    rotated = await rotate(repository, session.token_id, now)
+
+    assert rotated is not None
+    assert rotated.id == session.id
+    assert rotated.token_id != session.token_id
+    assert rotated.previous_token_id == session.token_id
+    assert rotated.last_refresh == now
+    assert await repository.get_by_token_id(session.token_id) is None
+
+
+async def test_replay_within_reuse_window_returns_rotated_session(repository):
+    session = await add_session(repository)
+    now = datetime.now().replace(microsecond=0)
+    rotated = await rotate(repository, session.token_id, now)
+    assert rotated is not None
+
+    replayed = await rotate(repository, session.token_id, now + REUSE_WINDOW - timedelta(seconds=1))
+
+    assert replayed is not None
+    assert replayed.token_id == rotated.token_id
+
+
+async def test_replay_after_reuse_window_is_rejected(repository):
+    session = await add_session(repository)
+    now = datetime.now().replace(microsecond=0)
+    assert await rotate(repository, session.token_id, now) is not None
+
+    assert await rotate(repository, session.token_id, now + REUSE_WINDOW + timedelta(seconds=1)) is None
+
+
+async def test_replay_of_older_token_is_rejected(repository):
+    session = await add_session(repository)
+    now = datetime.now().replace(microsecond=0)
+    rotated = await rotate(repository, session.token_id, now)
+    assert rotated is not None
+    assert await rotate(repository, rotated.token_id, now) is not None
+
+    assert await rotate(repository, session.token_id, now) is None
+
+
+async def test_expired_session_is_not_rotated(repository):
+    now = datetime.now().replace(microsecond=0)
+    session = await add_session(repository, expires_at=now - timedelta(seconds=1))
+
+    assert await rotate(repository, session.token_id, now) is None
+
+
+async def test_legacy_session_without_expires_at_uses_last_refresh(repository):
+    now = datetime.now().replace(microsecond=0)
+    live = await add_session(repository)
+    stale = await add_session(repository, last_refresh=now - EXPIRE - timedelta(seconds=1))
+    for session in (live, stale):
+        await OAuth2SessionODM.find_one(OAuth2SessionODM.id == session.id).update({"$set": {"expires_at": None}})
+
+    assert await rotate(repository, live.token_id, now) is not None
+    assert await rotate(repository, stale.token_id, now) is None
@@ -0,0 +1,131 @@
+import asyncio
+from datetime import timedelta
+from uuid import uuid4
+
+import jwcrypto.jwk
+import pytest
+
+from src.oauth2.cache import IssuedTokensCache
+from src.oauth2.config import settings
+from src.oauth2.entities import GrantType
+from src.oauth2.service import OAuthService
+from src.oauth2.use_cases import OAuthTokenCommand, OAuthTokenUseCase
+from src.oauth2_sessions.dto import CreateOAuth2SessionDTO
+from src.oauth2_sessions.entities import OAuth2Session
+from src.oauth2_sessions.service import OAuthSessionsService
+from src.schemas import AppScopes, KeyPair
+from src.services.jwe import ImplJWE
+from src.services.jwt import ImplJWT
+from src.services.key_manager import KeyManager
+from src.services.scope_registry import ScopeRegistry
+from tests.fake_redis import FakeRedis
+from tests.oauth2_sessions_repo import InMemoryOAuth2SessionsRepository
+
+PRIVATE_KEY = jwcrypto.jwk.JWK.generate(kty="RSA", size=2048)
+PUBLIC_KEY = jwcrypto.jwk.JWK.from_pem(PRIVATE_KEY.export_to_pem())
+
+
+@pytest.fixture
+def repository() -> InMemoryOAuth2SessionsRepository:
+    return InMemoryOAuth2SessionsRepository()
+
+
+@pytest.fixture
+def service(repository) -> OAuthSessionsService:
+    return OAuthSessionsService(repository=repository)
+
+
+@pytest.fixture
+async def session(service) -> OAuth2Session:
+    return await service.create_new_session(CreateOAuth2SessionDTO(user_id=uuid4(), client_id=uuid4(), scopes=["read"]))
+
+
+async def test_rotate_replaces_token_id(service, session):
+    token_id = session.token_id
+
+    rotated = await service.rotate_token_id(token_id)
+
+    assert rotated is not None
+    assert rotated.id == session.id
+    assert rotated.token_id != token_id
+    assert rotated.previous_token_id == token_id
+
+
+async def test_replay_within_reuse_window_returns_same_token(service, session):
+    token_id = session.token_id
+    rotated = await service.rotate_token_id(token_id)
+    assert rotated is not None
+    new_token_id = rotated.token_id
+
+    replayed = await service.rotate_token_id(token_id)
+
+    assert replayed is not None
+    assert replayed.token_id == new_token_id
+
+
+async def test_replay_after_reuse_window_is_rejected(service, repository, session):
+    token_id = session.token_id
+    rotated = await service.rotate_token_id(token_id)
+    assert rotated is not None
+    repository.sessions[rotated.id].last_refresh -= timedelta(seconds=settings.REFRESH_TOKEN_REUSE_WINDOW_SECONDS + 1)
+
+    assert await service.rotate_token_id(token_id) is None
+
+
+async def test_replay_of_older_token_is_rejected(service, session):
+    token_id = session.token_id
+    rotated = await service.rotate_token_id(token_id)
+    assert rotated is not None
+    assert await service.rotate_token_id(rotated.token_id) is not None
+
+    assert await service.rotate_token_id(token_id) is None
+
+
+async def test_concurrent_rotations_agree_on_new_token(service, session):
+    results = await asyncio.gather(*(service.rotate_token_id(session.token_id) for _ in range(10)))
+
+    assert all(result is not None for result in results)
+    assert len({result.token_id for result in results if result is not None}) == 1
+
+
+async def test_expired_session_is_not_rotated(service, repository, session):
+    repository.sessions[session.id].expires_at -= timedelta(hours=settings.REFRESH_TOKEN_EXPIRE_HOURS + 1)
+
+    assert await service.rotate_token_id(session.token_id) is None
+
+
+@pytest.fixture
+def token_use_case(service) -> OAuthTokenUseCase:
+    key_manager = KeyManager(key_pairs=[KeyPair(private_key=PRIVATE_KEY, public_key=PUBLIC_KEY)])
+    return OAuthTokenUseCase(
+        oauth_service=OAuthService(
+            sessions_service=service,
+            jwt=ImplJWT(key_manager=key_manager, issuer="http://test", audience="http://test"),
+            jwe=ImplJWE(key_manager=key_manager),
+            scope_registry=ScopeRegistry(AppScopes.model_validate([{"name": "read"}])),
+        ),
+        sessions_service=service,
+        requests_service=None,  # type: ignore
+        apps_service=None,  # type: ignore
+        issued_tokens=IssuedTokensCache(redis=FakeRedis()),  # type: ignore
+    )
+
+
+async def test_retried_refresh_returns_the_same_token_pair(token_use_case, session):
+    refresh_token = await token_use_case.oauth_service.create_refresh_token(session.token_id)
+    command = OAuthTokenCommand(grant_type=GrantType.refresh_token, refresh_token=refresh_token)
+
+    first = await token_use_case.execute(command)
+    retried = await token_use_case.execute(command)
+
+    assert retried == first
+    assert first.refresh_token != refresh_token
+
+
+async def test_concurrent_refreshes_return_the_same_token_pair(token_use_case, session):
+    refresh_token = await token_use_case.oauth_service.create_refresh_token(session.token_id)
+    command = OAuthTokenCommand(grant_type=GrantType.refresh_token, refresh_token=refresh_token)
+
+    results = await asyncio.gather(*(token_use_case.execute(command) for _ in range(5)))
+
+    assert all(result == results[0] for result in results)
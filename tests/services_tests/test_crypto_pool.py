@@ -0,0 +1,57 @@
+import asyncio
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import jwcrypto.jwk
+import pytest
+
+from src.schemas import KeyPair
+from src.services.crypto_pool import CryptoPool, ProcessPoolJWT
+from src.services.key_manager import KeyManager
+
+ISSUER = "http://issuer"
+
+
+def make_key_pair() -> KeyPair:
+    private_key = jwcrypto.jwk.JWK.generate(kty="RSA", size=2048)
+    return KeyPair(private_key=private_key, public_key=jwcrypto.jwk.JWK.from_json(private_key.export_public()))
+
+
+@pytest.fixture
+def crypto_pool():
+    pool = CryptoPool(
+        key_manager=KeyManager(key_pairs=[make_key_pair()]),
+        issuer=ISSUER,
+        audience=ISSUER,
+        jwe_algorithm="RSA-OAEP-256",
+        workers=1,
+        batch_size=32,
+        batch_delay=0,
+    )
+    yield pool
+    pool.close()
+
+
+def kill_workers(pool: CryptoPool) -> None:
+    processes = list(pool.executor._processes.values())  # type: ignore[attr-defined]
+    for process in processes:
+        os.kill(process.pid, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while not pool.executor._broken and time.monotonic() < deadline:  # type: ignore[attr-defined]
+        time.sleep(0.01)
+
+
+async def test_recovers_after_worker_crash(crypto_pool: CryptoPool):
+    jwt_service = ProcessPoolJWT(pool=crypto_pool)
+    token = await asyncio.wait_for(jwt_service.encode({"sub": "user", "exp": int(time.time()) + 60}), 30)
+    assert await asyncio.wait_for(jwt_service.decode(token), 30) is not None
+
+    kill_workers(crypto_pool)
+
+    with pytest.raises(BrokenProcessPool):
+        await asyncio.wait_for(jwt_service.encode({"sub": "user"}), 30)
+
+    token = await asyncio.wait_for(jwt_service.encode({"sub": "user", "exp": int(time.time()) + 60}), 30)
+    assert await asyncio.wait_for(jwt_service.decode(token), 30) is not None
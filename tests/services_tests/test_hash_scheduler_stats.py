@@ -0,0 +1,49 @@
+import asyncio
+import logging
+
+from src.services.hash import Hash, HashScheduler
+from src.services.stats import StatsReporter
+
+
+class BlockingHash(Hash):
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def create(self, value: str | bytes) -> bytes:
+        await self.release.wait()
+        return b"hash"
+
+    async def check(self, value: str | bytes, hashed_value: bytes) -> bool:
+        await self.release.wait()
+        return True
+
+
+async def test_snapshot_reports_queue_depth_and_wait_time():
+    hash_service = BlockingHash()
+    scheduler = HashScheduler(hash_service=hash_service, max_concurrency=1, max_queue_size=4, queue_timeout=1)
+
+    tasks = [asyncio.create_task(scheduler.create("value")) for _ in range(3)]
+    await asyncio.sleep(0)
+    snapshot = scheduler.stats.snapshot()
+    assert snapshot["in_flight"] == 1
+    assert snapshot["queue_depth"] == 2
+
+    hash_service.release.set()
+    await asyncio.gather(*tasks)
+    snapshot = scheduler.stats.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["queue_depth"] == 0
+    assert snapshot["admitted"] == 3
+    assert snapshot["max_wait_seconds"] >= snapshot["avg_wait_seconds"] >= 0
+
+
+async def test_reporter_logs_registered_sources(caplog):
+    scheduler = HashScheduler(hash_service=BlockingHash(), max_concurrency=1, max_queue_size=4, queue_timeout=1)
+    reporter = StatsReporter(interval=60)
+    reporter.register("hash_scheduler", scheduler.stats.snapshot)
+
+    with caplog.at_level(logging.INFO):
+        reporter.report()
+
+    assert reporter.collect()["hash_scheduler"]["queue_depth"] == 0
+    assert "hash_scheduler stats: in_flight=0 queue_depth=0" in caplog.text
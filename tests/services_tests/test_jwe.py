@@ -0,0 +1,37 @@
+import jwcrypto.jwk
+import pytest
+from jwcrypto import jwe
+
+from src.schemas import KeyPair
+from src.services.jwe import DIRECT_ALGORITHM, RSA_ALGORITHM, ImplJWE
+from src.services.key_manager import KeyManager
+
+
+def make_key_pair(**params) -> KeyPair:
+    private_key = jwcrypto.jwk.JWK.generate(**params)
+    return KeyPair(private_key=private_key, public_key=jwcrypto.jwk.JWK.from_json(private_key.export_public()))
+
+
+RSA_KEY_PAIR = make_key_pair(kty="RSA", size=2048)
+
+
+@pytest.fixture
+def key_manager() -> KeyManager:
+    return KeyManager(key_pairs=[RSA_KEY_PAIR])
+
+
+@pytest.mark.parametrize("algorithm", [RSA_ALGORITHM, DIRECT_ALGORITHM])
+async def test_round_trip(key_manager: KeyManager, algorithm: str):
+    service = ImplJWE(key_manager=key_manager, algorithm=algorithm)
+
+    assert await service.decode(await service.encode(b"payload")) == b"payload"
+
+
+async def test_disallowed_algorithm_is_rejected(key_manager: KeyManager):
+    key = key_manager.get_random_encryption_key()
+    protected_header = {"alg": "RSA-OAEP", "enc": "A256GCM", "typ": "JWE", "kid": key.kid}
+    token = jwe.JWE(
+        b"payload", recipient=key.key_pair.public_key, protected=protected_header, algs=["RSA-OAEP", "A256GCM"]
+    ).serialize(compact=True)
+
+    assert await ImplJWE(key_manager=key_manager).decode(token) is None
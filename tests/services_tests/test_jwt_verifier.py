@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import time
+
+import jwcrypto.jwk
+import jwt
+import orjson
+import pytest
+from jwt.utils import base64url_encode
+
+from src.schemas import KeyPair
+from src.services.jwt import ImplJWT
+from src.services.key_manager import KeyManager
+
+ISSUER = "http://issuer"
+AUDIENCE = "http://audience"
+
+
+def make_key_pair(**params) -> KeyPair:
+    private_key = jwcrypto.jwk.JWK.generate(**params)
+    return KeyPair(private_key=private_key, public_key=jwcrypto.jwk.JWK.from_json(private_key.export_public()))
+
+
+RSA_KEY_PAIR = make_key_pair(kty="RSA", size=2048)
+UNKNOWN_KEY_PAIR = make_key_pair(kty="RSA", size=2048)
+
+
+@pytest.fixture
+def key_manager() -> KeyManager:
+    return KeyManager(key_pairs=[RSA_KEY_PAIR])
+
+
+@pytest.fixture
+def jwt_service(key_manager: KeyManager) -> ImplJWT:
+    return ImplJWT(key_manager=key_manager, issuer=ISSUER, audience=AUDIENCE)
+
+
+def claims(**overrides) -> dict:
+    return {"sub": "user", "aud": AUDIENCE, "exp": int(time.time()) + 60} | overrides
+
+
+def encode_segment(data: dict) -> str:
+    return base64url_encode(orjson.dumps(data)).decode()
+
+
+def hs256_token(header: dict, payload: dict, secret: bytes) -> str:
+    signing_input = f"{encode_segment(header)}.{encode_segment(payload)}"
+    signature = hmac.new(secret, signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{base64url_encode(signature).decode()}"
+
+
+async def test_accepts_valid_token(jwt_service: ImplJWT):
+    token = await jwt_service.encode(claims())
+
+    payload = await jwt_service.decode(token, audience=AUDIENCE)
+
+    assert payload is not None
+    assert payload["sub"] == "user"
+    assert payload["iss"] == ISSUER
+
+
+async def test_accepts_audience_list(jwt_service: ImplJWT):
+    token = await jwt_service.encode(claims(aud=["http://other", AUDIENCE]))
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is not None
+
+
+@pytest.mark.parametrize("aud", ["http://other", ["http://other"], None])
+async def test_rejects_wrong_audience(jwt_service: ImplJWT, aud):
+    token = await jwt_service.encode(claims(aud=aud))
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_expired_token(jwt_service: ImplJWT):
+    token = await jwt_service.encode(claims(exp=int(time.time()) - 1))
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_token_without_exp(jwt_service: ImplJWT):
+    payload = claims()
+    del payload["exp"]
+    token = await jwt_service.encode(payload)
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_token_not_yet_valid(jwt_service: ImplJWT):
+    token = await jwt_service.encode(claims(nbf=int(time.time()) + 60))
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_foreign_issuer(key_manager: KeyManager):
+    token = ImplJWT(key_manager=key_manager, issuer="http://other", audience=AUDIENCE).sign(claims())
+    jwt_service = ImplJWT(key_manager=key_manager, issuer=ISSUER, audience=AUDIENCE)
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_hmac_signed_with_public_key(jwt_service: ImplJWT):
+    public_pem = RSA_KEY_PAIR.public_key.export_to_pem()
+    token = hs256_token(
+        {"alg": "HS256", "typ": "JWT", "kid": RSA_KEY_PAIR.private_key.thumbprint()},
+        claims(iss=ISSUER),
+        public_pem,
+    )
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_unsigned_token(jwt_service: ImplJWT):
+    header = {"alg": "none", "typ": "JWT", "kid": RSA_KEY_PAIR.private_key.thumbprint()}
+    token = f"{encode_segment(header)}.{encode_segment(claims(iss=ISSUER))}."
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_algorithm_other_than_the_key_algorithm(jwt_service: ImplJWT):
+    token = jwt.encode(
+        claims(iss=ISSUER),
+        RSA_KEY_PAIR.private_key.export_to_pem(private_key=True, password=None),
+        algorithm="RS512",
+        headers={"kid": RSA_KEY_PAIR.private_key.thumbprint()},
+    )
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_unknown_kid(jwt_service: ImplJWT):
+    token = jwt.encode(
+        claims(iss=ISSUER),
+        UNKNOWN_KEY_PAIR.private_key.export_to_pem(private_key=True, password=None),
+        algorithm="RS256",
+        headers={"kid": UNKNOWN_KEY_PAIR.private_key.thumbprint()},
+    )
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_known_kid_signed_by_another_key(jwt_service: ImplJWT):
+    token = jwt.encode(
+        claims(iss=ISSUER),
+        UNKNOWN_KEY_PAIR.private_key.export_to_pem(private_key=True, password=None),
+        algorithm="RS256",
+        headers={"kid": RSA_KEY_PAIR.private_key.thumbprint()},
+    )
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_rejects_tampered_payload(jwt_service: ImplJWT):
+    header, _, signature = (await jwt_service.encode(claims())).split(".")
+    token = f"{header}.{encode_segment(claims(iss=ISSUER, sub='admin'))}.{signature}"
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is None
+
+
+async def test_accepts_retired_key_after_rotation(jwt_service: ImplJWT, key_manager: KeyManager):
+    token = await jwt_service.encode(claims())
+    key_manager.rotate([UNKNOWN_KEY_PAIR], grace_period=60)
+
+    assert await jwt_service.decode(token, audience=AUDIENCE) is not None
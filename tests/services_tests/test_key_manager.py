@@ -0,0 +1,110 @@
+import time
+
+import jwcrypto.jwk
+import pytest
+
+from src.schemas import KeyPair
+from src.services.key_manager import KeyManager
+from src.utils import create_key_pairs
+
+
+def make_key_pair(**params) -> KeyPair:
+    private_key = jwcrypto.jwk.JWK.generate(**params)
+    return KeyPair(private_key=private_key, public_key=jwcrypto.jwk.JWK.from_json(private_key.export_public()))
+
+
+RSA_KEY_PAIR = make_key_pair(kty="RSA", size=2048)
+SECOND_RSA_KEY_PAIR = make_key_pair(kty="RSA", size=2048)
+ED25519_KEY_PAIR = make_key_pair(kty="OKP", crv="Ed25519")
+
+
+@pytest.fixture
+def key_manager() -> KeyManager:
+    return KeyManager(key_pairs=[RSA_KEY_PAIR], require_encryption_keys=True)
+
+
+def test_rejects_initial_key_set_without_encryption_keys():
+    with pytest.raises(ValueError):
+        KeyManager(key_pairs=[ED25519_KEY_PAIR], require_encryption_keys=True)
+
+
+def test_allows_signing_only_key_set_without_encryption_requirement():
+    key_manager = KeyManager(key_pairs=[ED25519_KEY_PAIR])
+
+    assert key_manager.encryption_keys == []
+
+
+def test_rotation_retires_previous_keys(key_manager: KeyManager):
+    key_manager.rotate([SECOND_RSA_KEY_PAIR], grace_period=60)
+
+    assert [key.key_pair for key in key_manager.key_set.active_keys] == [SECOND_RSA_KEY_PAIR]
+    assert [key.key_pair for key in key_manager.key_set.retired_keys] == [RSA_KEY_PAIR]
+
+
+@pytest.mark.parametrize("key_pairs", [[], [ED25519_KEY_PAIR]])
+def test_failed_rotation_leaves_state_unchanged(key_manager: KeyManager, key_pairs: list[KeyPair]):
+    notified = []
+    key_manager.subscribe(lambda: notified.append(True))
+    key_set = key_manager.key_set
+
+    with pytest.raises(ValueError):
+        key_manager.rotate(key_pairs, grace_period=60)
+
+    assert key_manager.key_set is key_set
+    assert key_manager.key_set.retired_keys == []
+    assert not notified
+    key_manager.refresh(grace_period=0)
+    assert key_manager.key_set is key_set
+    assert key_manager.get_random_encryption_key().key_pair is RSA_KEY_PAIR
+
+
+def test_new_keys_are_staged_until_activation_delay(key_manager: KeyManager, monkeypatch):
+    notified = []
+    key_manager.subscribe(lambda: notified.append(True))
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    second_kid = SECOND_RSA_KEY_PAIR.private_key.thumbprint()
+
+    key_manager.rotate([SECOND_RSA_KEY_PAIR], grace_period=600, activation_delay=60)
+
+    assert [key.key_pair for key in key_manager.key_set.active_keys] == [RSA_KEY_PAIR]
+    assert [key.key_pair for key in key_manager.key_set.staged_keys] == [SECOND_RSA_KEY_PAIR]
+    assert key_manager.key_set.retired_keys == []
+    assert second_kid in key_manager.keys_by_kid
+    assert second_kid in key_manager.private_keys_by_kid
+    assert key_manager.get_random_key().key_pair is RSA_KEY_PAIR
+    assert notified == [True]
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 30)
+    key_manager.refresh(grace_period=600, activation_delay=60)
+    assert [key.key_pair for key in key_manager.key_set.staged_keys] == [SECOND_RSA_KEY_PAIR]
+    assert notified == [True]
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 60)
+    key_manager.refresh(grace_period=600, activation_delay=60)
+    assert [key.key_pair for key in key_manager.key_set.active_keys] == [SECOND_RSA_KEY_PAIR]
+    assert key_manager.key_set.staged_keys == []
+    assert [key.key_pair for key in key_manager.key_set.retired_keys] == [RSA_KEY_PAIR]
+    assert notified == [True, True]
+
+
+def test_added_key_is_staged_next_to_existing_active_key(key_manager: KeyManager):
+    key_manager.rotate([RSA_KEY_PAIR, SECOND_RSA_KEY_PAIR], grace_period=600, activation_delay=60)
+
+    assert [key.key_pair for key in key_manager.key_set.active_keys] == [RSA_KEY_PAIR]
+    assert [key.key_pair for key in key_manager.key_set.staged_keys] == [SECOND_RSA_KEY_PAIR]
+
+
+def test_export_certs_keeps_staged_keys_verify_only(key_manager: KeyManager):
+    key_manager.rotate([SECOND_RSA_KEY_PAIR], grace_period=600, activation_delay=60)
+    certs, staged_certs, retired_certs = key_manager.export_certs()
+
+    worker_key_manager = KeyManager(
+        key_pairs=create_key_pairs(certs),
+        staged_key_pairs=create_key_pairs(staged_certs),
+        retired_key_pairs=create_key_pairs(retired_certs),
+    )
+
+    assert [key.kid for key in worker_key_manager.key_set.active_keys] == [RSA_KEY_PAIR.private_key.thumbprint()]
+    assert [key.kid for key in worker_key_manager.key_set.staged_keys] == [SECOND_RSA_KEY_PAIR.private_key.thumbprint()]
+    assert worker_key_manager.key_set.retired_keys == []
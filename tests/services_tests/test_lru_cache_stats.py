@@ -0,0 +1,39 @@
+from src.auth.cache import InvalidSessionTokensCache
+from src.services.lru_cache import LRUCache
+from src.services.stats import StatsReporter
+
+
+def test_snapshot_reports_hits_misses_and_evictions():
+    cache: LRUCache[str, int] = LRUCache(maxsize=1, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.set("b", 2)
+
+    assert cache.stats.snapshot() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+        "evictions": 1,
+        "expirations": 0,
+    }
+
+
+def test_snapshot_reports_expirations():
+    cache: LRUCache[str, int] = LRUCache(maxsize=1, ttl=60)
+    cache.set("a", 1, ttl=0)
+
+    assert cache.get("a") is None
+    assert cache.stats.snapshot()["expirations"] == 1
+
+
+def test_reporter_collects_live_cache_stats():
+    cache = InvalidSessionTokensCache(maxsize=10, ttl=60)
+    reporter = StatsReporter(interval=60)
+    reporter.register("invalid_session_tokens_cache", cache.stats.snapshot)
+
+    cache.add("token")
+    assert "token" in cache
+    assert "other" not in cache
+
+    assert reporter.collect()["invalid_session_tokens_cache"]["hit_ratio"] == 0.5
@@ -0,0 +1,42 @@
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from src.apps.models import AppODM
+from src.oauth2_sessions.models import OAuth2SessionODM
+from src.services.query_plans import get_query_shapes
+from src.sessions.models import SessionODM
+from src.users.models import UserODM
+
+
+def required_fields(filter: Mapping[str, Any]) -> set[str]:
+    fields = set()
+    for key, value in filter.items():
+        if key == "$and":
+            for clause in value:
+                fields |= required_fields(clause)
+        elif not key.startswith("$"):
+            fields.add(key)
+    return fields
+
+
+@pytest.fixture
+async def database():
+    await init_beanie(
+        database=AsyncMongoMockClient()["auth_service"],
+        document_models=[UserODM, SessionODM, OAuth2SessionODM, AppODM],
+    )
+
+
+async def test_query_shapes_lead_with_an_indexed_field(database):
+    unindexed = []
+    for shape in get_query_shapes():
+        indexes = await shape.model.get_motor_collection().index_information()
+        leading_fields = {next(iter(index["key"]))[0] for index in indexes.values()}
+        if not required_fields(shape.filter) & leading_fields:
+            unindexed.append(shape.name)
+
+    assert unindexed == []
@@ -1,29 +1,68 @@
+from collections.abc import AsyncIterator
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from src.sessions.entities import Session
+from src.sessions.dto import SessionsCursor, SessionsFilterDTO
+from src.sessions.entities import Session, SessionFields
 from src.sessions.repository import ISessionsRepository
+from src.users.entities import User
 
 
 class InMemorySessionsRepository(ISessionsRepository):
-    def __init__(self):
+    def __init__(self, users: dict[UUID, User] | None = None):
         self.sessions: dict[UUID, Session] = {}
+        self.users: dict[UUID, User] = users if users is not None else {}
 
-    async def add(self, session: Session) -> Session:
-        if session.id is None:
-            session.id = uuid4()
-        self.sessions[session.id] = session
-        return session
+    async def add(self, session: SessionFields) -> Session:
+        new_session = Session(id=uuid4(), **session.__dict__)
+        self.sessions[new_session.id] = new_session
+        return new_session
 
     async def get_by_id(self, session_id: UUID) -> Session | None:
         return self.sessions.get(session_id)
 
+    async def get_by_id_with_user(self, session_id: UUID) -> tuple[Session, User] | None:
+        session = self.sessions.get(session_id)
+        if session is None or session.user_id not in self.users:
+            return None
+        return session, self.users[session.user_id]
+
+    async def get_by_user_id(self, user_id: UUID, limit: int, after: SessionsCursor | None = None) -> list[Session]:
+        sessions = sorted(
+            (s for s in self.sessions.values() if s.user_id == user_id),
+            key=lambda s: (s.last_used, s.id.bytes),
+            reverse=True,
+        )
+        if after is not None:
+            sessions = [s for s in sessions if (s.last_used, s.id.bytes) < (after.last_used, after.id.bytes)]
+        return sessions[:limit]
+
     async def update_last_used(self, session_id: UUID, last_used: datetime) -> None:
         session = self.sessions[session_id]
         session.last_used = last_used
 
+    async def bulk_update_last_used(self, updates: dict[UUID, datetime]) -> None:
+        for session_id, last_used in updates.items():
+            session = self.sessions.get(session_id)
+            if session is not None and session.last_used < last_used:
+                session.last_used = last_used
+
     async def delete_session(self, session_id: UUID) -> Session | None:
         return self.sessions.pop(session_id, None)
 
     async def delete_all_session_by_user_id(self, user_id: UUID) -> None:
         self.sessions = {k: v for k, v in self.sessions.items() if v.user_id != user_id}
+
+    async def delete_many(self, filter: SessionsFilterDTO, batch_size: int) -> AsyncIterator[list[UUID]]:
+        session_ids = [
+            s.id
+            for s in self.sessions.values()
+            if (filter.user_ids is None or s.user_id in filter.user_ids)
+            and (filter.ip_address is None or s.ip_address == filter.ip_address)
+            and (filter.expires_before is None or s.expires_at < filter.expires_before)
+        ]
+        for i in range(0, len(session_ids), batch_size):
+            batch = session_ids[i : i + batch_size]
+            for session_id in batch:
+                del self.sessions[session_id]
+            yield batch
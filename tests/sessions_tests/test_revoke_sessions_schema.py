@@ -0,0 +1,29 @@
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from src.sessions.schemas import RevokeSessionsSchema
+
+
+def test_requires_a_filter():
+    with pytest.raises(ValidationError):
+        RevokeSessionsSchema()
+
+
+def test_rejects_ip_address_with_client_id():
+    with pytest.raises(ValidationError):
+        RevokeSessionsSchema(ip_address="127.0.0.1", client_id=uuid4())
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"ip_address": "127.0.0.1"},
+        {"client_id": uuid4()},
+        {"user_ids": [uuid4()], "ip_address": "127.0.0.1"},
+        {"user_ids": [uuid4()], "client_id": uuid4()},
+    ],
+)
+def test_accepts_single_session_kind_filters(filters):
+    RevokeSessionsSchema(**filters)